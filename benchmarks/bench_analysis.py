@@ -0,0 +1,239 @@
+import argparse
+import ast
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ================================================================================
+# 전력 데이터 분석 페이지 계산 함수 벤치마크
+# ================================================================================
+# 페이지 스크립트는 import 하면 화면 전체가 실행되므로, 소스에서 필요한 함수 정의와
+# import 문만 골라(ast) st.cache_data / st.cache_resource 를 통과 데코레이터로 바꾼
+# 네임스페이스에서 실행한다. 캐시 없이 매번 실제 계산 비용을 잰다.
+#
+#   python benchmarks/bench_analysis.py                       # 1×, 10×, 100×, 1000×
+#   python benchmarks/bench_analysis.py --scales 1 10 --repeat 5 --out bench.json
+#
+# 배율 k 의 합성 데이터는 train_dash_df.csv 를 k 번 이어 붙이되 복제본마다 측정일시를
+# (원본 기간을 주 단위로 올림한 길이)만큼 밀어 요일 / 시간대 패턴을 유지한다.
+# 결과는 함수·케이스별 wall time(반복 중앙값 / 최소)과 tracemalloc 최대 메모리(MiB)의 JSON.
+
+ROOT = Path(__file__).resolve().parents[1]
+DASH = ROOT / '대시보드'
+PAGE = DASH / 'pages' / '2_전력 데이터 분석.py'
+TRAIN_CSV = DASH / 'data_dash' / 'train_dash_df.csv'
+
+PAGE_FUNCTIONS = (
+    'load_data', 'get_monthly_summary', 'filter_dataframe', 'filter_bounds', 'filter_cube',
+    'calculate_time_based_metrics', 'get_idle_data',
+)
+
+DEFAULT_SCALES = (1, 10, 100, 1000)
+
+sys.path.insert(0, str(DASH))
+
+from cube import build_cube, build_slot_table, cycle_profile, rollup  # noqa: E402
+from idle import IdleEngine  # noqa: E402
+from row_index import RowIndex  # noqa: E402
+from summary import build_daily, build_monthly  # noqa: E402
+
+
+# ================================================================================
+# 페이지 함수 로드 (Streamlit 없이)
+# ================================================================================
+
+def _passthrough(*args, **kwargs):
+    """@st.cache_data / @st.cache_data(...) 둘 다 원래 함수를 그대로 돌려줌"""
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda fn: fn
+
+
+def load_page_functions(page=PAGE, names=PAGE_FUNCTIONS) -> types.SimpleNamespace:
+    """페이지 소스에서 names 함수와 import 문만 실행한 네임스페이스"""
+    tree = ast.parse(Path(page).read_text(encoding='utf-8'))
+    body = []
+    for node in tree.body:
+        if isinstance(node, ast.Import) and any(a.name == 'streamlit' for a in node.names):
+            continue
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            body.append(node)
+        elif isinstance(node, ast.FunctionDef) and node.name in names:
+            body.append(node)
+    missing = set(names) - {n.name for n in body if isinstance(n, ast.FunctionDef)}
+    if missing:
+        raise LookupError(f"페이지에 없는 함수: {sorted(missing)}")
+
+    stub = types.SimpleNamespace(cache_data=_passthrough, cache_resource=_passthrough)
+    namespace = {'st': stub, '__name__': 'bench_page'}
+    exec(compile(ast.Module(body=body, type_ignores=[]), str(page), 'exec'), namespace)
+    return types.SimpleNamespace(**{name: namespace[name] for name in names})
+
+
+# ================================================================================
+# 합성 데이터
+# ================================================================================
+
+def write_scaled_csv(base: pd.DataFrame, scale: int, path: Path) -> int:
+    """base 를 scale 번 이어 붙인 CSV 저장 (복제본 단위로 추가 기록) → 행 수"""
+    ts = pd.to_datetime(base['측정일시'])
+    span_days = (ts.max().normalize() - ts.min().normalize()).days + 1
+    shift = pd.Timedelta(days=-(-span_days // 7) * 7)
+    for k in range(scale):
+        part = base.assign(측정일시=(ts + k * shift).dt.strftime('%Y-%m-%d %H:%M:%S'))
+        part.to_csv(path, mode='w' if k == 0 else 'a', header=k == 0, index=False)
+    return len(base) * scale
+
+
+# ================================================================================
+# 측정
+# ================================================================================
+
+def measure(fn, *args, repeat: int = 3, **kwargs) -> dict:
+    """wall time (repeat 회 중앙값 / 최소) + 별도 1회 실행의 tracemalloc 최대 메모리"""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args, **kwargs)
+        times.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'wall_s': statistics.median(times),
+        'wall_min_s': min(times),
+        'repeat': repeat,
+        'peak_mib': (peak - base) / 2**20,
+    }
+
+
+def bench_scale(page, csv_path: Path, repeat: int) -> list:
+    """하나의 데이터 파일에 대해 페이지 계산 경로 전체를 측정"""
+    results = []
+
+    def run(function, case, fn, *args, **kwargs):
+        row = {'function': function, 'case': case, **measure(fn, *args, repeat=repeat, **kwargs)}
+        results.append(row)
+        print(f"  {function:<30} {case:<28} {row['wall_s'] * 1e3:10.1f} ms {row['peak_mib']:9.1f} MiB",
+              file=sys.stderr)
+
+    sidecar = csv_path.with_suffix('.parquet')
+
+    def load_cold():
+        sidecar.unlink(missing_ok=True)
+        return page.load_data(csv_path)
+
+    run('load_data', 'cold (CSV + sidecar write)', load_cold)
+    run('load_data', 'warm (Parquet sidecar)', page.load_data, csv_path)
+
+    df = page.load_data(csv_path)
+    run('build_cube', 'all rows', build_cube, df)
+    run('build_slot_table', 'all rows', build_slot_table, df)
+    run('RowIndex', 'all rows', RowIndex, df)
+    cube = build_cube(df)
+    slots = build_slot_table(df)
+    row_index = RowIndex(df)
+
+    def build_idle():
+        engine = IdleEngine()
+        engine.extend(slots)
+        return engine
+
+    run('IdleEngine.extend', 'all days', build_idle)
+    run('build_daily/monthly', 'summary', lambda: build_monthly(build_daily(df)))
+    engine = build_idle()
+    monthly = build_monthly(build_daily(df))
+
+    first_day = df['측정일시'].iloc[0].normalize()
+    filters = {
+        '전체 기간 / 전체': ('월별', '전체 기간', '전체'),
+        '3월 / 가동': ('월별', '3월', '가동'),
+        '일별 18일 / 휴무': ('일별', 'range', '휴무'),
+    }
+    dates = (str(first_day.date()), str((first_day + pd.Timedelta(days=17)).date()))
+    for case, (unit, period, status) in filters.items():
+        key = (unit, period, status, *dates)
+        run('filter_dataframe', case, page.filter_dataframe, df, row_index, *key)
+        run('filter_cube', case, page.filter_cube, cube, *key)
+        subset = page.filter_cube(cube, *key)
+        slot_subset = page.filter_cube(slots, *key)
+        run('calculate_time_based_metrics', case, page.calculate_time_based_metrics, subset)
+        run('get_idle_data', case, page.get_idle_data, engine, page.filter_bounds(*key))
+        # 탭 집계 (월별 / 일별 / 시간대 / 역률 주기)
+        run('tab: rollup month', case, rollup, subset, 'month')
+        run('tab: rollup date×작업유형', case, rollup, subset, ['date', '작업유형'])
+        run('tab: rollup hour', case, rollup, subset, 'hour')
+        run('tab: cycle_profile pf', case, cycle_profile, slot_subset, ['lag_pf', 'lead_pf'])
+    run('get_monthly_summary', 'all months', page.get_monthly_summary, monthly)
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description='전력 데이터 분석 페이지 계산 함수 벤치마크')
+    parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES),
+                        help='원본 대비 데이터 배율 (기본: 1 10 100 1000)')
+    parser.add_argument('--repeat', type=int, default=3, help='함수별 반복 횟수 (중앙값 보고)')
+    parser.add_argument('--source', type=Path, default=TRAIN_CSV, help='기준 CSV')
+    parser.add_argument('--out', type=Path, help='JSON 저장 경로 (없으면 stdout)')
+    args = parser.parse_args(argv)
+
+    page = load_page_functions()
+    base = pd.read_csv(args.source)
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'source': str(args.source),
+            'repeat': args.repeat,
+        },
+        'results': [],
+    }
+    with tempfile.TemporaryDirectory(prefix='bench_analysis_') as tmp:
+        for scale in args.scales:
+            csv_path = Path(tmp) / f'train_x{scale}.csv'
+            rows = write_scaled_csv(base, scale, csv_path)
+            print(f"[bench] ×{scale}: {rows:,} rows", file=sys.stderr)
+            for row in bench_scale(page, csv_path, args.repeat):
+                report['results'].append({'scale': scale, 'rows': rows, **row})
+            csv_path.unlink()
+            csv_path.with_suffix('.parquet').unlink(missing_ok=True)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        args.out.write_text(text, encoding='utf-8')
+        print(f"[bench] → {args.out}", file=sys.stderr)
+    else:
+        print(text)
+    return report
+
+
+if __name__ == '__main__':
+    main()
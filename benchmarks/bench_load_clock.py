@@ -0,0 +1,131 @@
+import argparse
+import ast
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+import types
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import plotly
+
+# ================================================================================
+# 실시간 모니터 부하 시계(load clock) 틱 비용 벤치마크
+# ================================================================================
+# 1_전력 및 전기요금 예측.py 는 import 하면 화면 전체가 실행되므로, 소스에서 부하 시계
+# 함수 / 상수 / import 문만 골라(ast) st.session_state 를 dict 로 바꾼 네임스페이스에서 실행한다.
+#   - rebuild: 틱마다 배경(세그먼트 / 라벨 / 레이아웃)을 새로 만들고 바늘을 세팅 (이전 방식)
+#   - cached : create_load_clock_chart — 상태별로 캐시된 배경에 바늘 각도만 갱신
+# 각각 Figure 갱신만 / to_json(브라우저로 보내는 직렬화) 포함 두 가지를 잰다.
+#
+#   python benchmarks/bench_load_clock.py
+#   python benchmarks/bench_load_clock.py --number 50 --repeat 5 --out bench_load_clock.json
+
+ROOT = Path(__file__).resolve().parents[1]
+DASH = ROOT / '대시보드'
+PAGE = DASH / '1_전력 및 전기요금 예측.py'
+
+PAGE_FUNCTIONS = ('get_cached_figure', 'build_load_clock_figure', 'create_load_clock_chart')
+
+sys.path.insert(0, str(DASH))
+
+
+def load_page_functions(page=PAGE, names=PAGE_FUNCTIONS) -> types.SimpleNamespace:
+    """페이지 소스에서 names 함수, 대문자 상수, import 문만 실행한 네임스페이스"""
+    tree = ast.parse(Path(page).read_text(encoding='utf-8'))
+    body = []
+    for node in tree.body:
+        if isinstance(node, ast.Import) and any(a.name == 'streamlit' for a in node.names):
+            continue
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            body.append(node)
+        elif isinstance(node, ast.Assign) and all(
+                isinstance(t, ast.Name) and t.id.isupper() for t in node.targets):
+            body.append(node)
+        elif isinstance(node, ast.FunctionDef) and node.name in names:
+            body.append(node)
+    missing = set(names) - {n.name for n in body if isinstance(n, ast.FunctionDef)}
+    if missing:
+        raise LookupError(f"페이지에 없는 함수: {sorted(missing)}")
+
+    stub = types.SimpleNamespace(session_state={})
+    namespace = {'st': stub, '__name__': 'bench_page'}
+    exec(compile(ast.Module(body=body, type_ignores=[]), str(page), 'exec'), namespace)
+    return types.SimpleNamespace(st=stub, **{name: namespace[name] for name in names})
+
+
+def rebuild_load_clock(page, latest):
+    """이전 방식: 틱마다 배경을 새로 만들고 바늘 / uirevision 세팅"""
+    status = latest['작업휴무']
+    ts = latest['측정일시']
+    fig = page.build_load_clock_figure(status)
+    theta = (ts.hour + ts.minute / 60.0) * 15
+    fig.data[-2].theta = [theta, theta]
+    fig.layout.uirevision = f"load_{status}_{ts.hour}"
+    return fig
+
+
+def per_call_ms(fn, number: int, repeat: int) -> dict:
+    """timeit number 회 × repeat → 1회당 ms (반복 중앙값 / 최소)"""
+    runs = [t / number * 1e3 for t in timeit.repeat(fn, number=number, repeat=repeat)]
+    return {'ms': statistics.median(runs), 'ms_min': min(runs), 'number': number, 'repeat': repeat}
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description='실시간 모니터 부하 시계 틱 비용 벤치마크')
+    parser.add_argument('--number', type=int, default=50, help='timeit 1회 반복 호출 수')
+    parser.add_argument('--repeat', type=int, default=5, help='timeit 반복 횟수 (중앙값 보고)')
+    parser.add_argument('--status', default='가동', choices=['가동', '휴무'], help='작업휴무 상태')
+    parser.add_argument('--time', default='13:45', help='측정 시각 (HH:MM)')
+    parser.add_argument('--out', type=Path, help='JSON 저장 경로 (없으면 stdout)')
+    args = parser.parse_args(argv)
+
+    page = load_page_functions()
+    latest = pd.Series({'작업휴무': args.status, '측정일시': pd.Timestamp(f'2024-12-02 {args.time}')})
+    page.create_load_clock_chart(latest)  # 캐시 채움 (세션 첫 틱)
+
+    cases = {
+        'rebuild': lambda: rebuild_load_clock(page, latest),
+        'rebuild + to_json': lambda: rebuild_load_clock(page, latest).to_json(),
+        'cached': lambda: page.create_load_clock_chart(latest),
+        'cached + to_json': lambda: page.create_load_clock_chart(latest).to_json(),
+    }
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'plotly': plotly.__version__,
+            'status': args.status,
+            'time': args.time,
+        },
+        'results': [],
+    }
+    for case, fn in cases.items():
+        row = {'case': case, **per_call_ms(fn, args.number, args.repeat)}
+        report['results'].append(row)
+        print(f"  {case:<20} {row['ms']:8.2f} ms / tick (min {row['ms_min']:.2f})", file=sys.stderr)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        args.out.write_text(text, encoding='utf-8')
+        print(f"[bench] → {args.out}", file=sys.stderr)
+    else:
+        print(text)
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+# ================================================================================
+# 고지서 차트 래스터화 백엔드 벤치마크
+# ================================================================================
+# 월별 고지서 차트(daily_usage / monthly_comp)를 백엔드마다 그려 이미지별 소요 시간을 잰다.
+# 백엔드는 프로세스당 한 번 정해지는 구조라 백엔드마다 report.set_chart_backend 로
+# 바꾸고 PNG 캐시를 비운 뒤 cold(캐시 미스) / warm(같은 데이터 재요청) 두 번 돈다.
+# 백엔드 선택에 걸린 시간(kaleido 상주 브라우저 기동 포함)은 'startup' 으로 따로 기록한다.
+#
+#   python benchmarks/bench_report.py                          # kaleido, matplotlib
+#   python benchmarks/bench_report.py --backends matplotlib --out bench_report.json
+
+ROOT = Path(__file__).resolve().parents[1]
+DASH = ROOT / '대시보드'
+
+CHART_TYPES = ('daily_usage', 'monthly_comp')
+
+sys.path.insert(0, str(DASH))
+
+import report  # noqa: E402
+from batch_report import SOURCE_CSV, load_bill_frame, split_periods  # noqa: E402
+from summary import load_summary  # noqa: E402
+
+
+def bench_backend(name: str, parts, monthly) -> dict:
+    """한 백엔드로 구간별 차트를 cold / warm 으로 그린 이미지별 기록"""
+    t0 = time.perf_counter()
+    backend = report.set_chart_backend(name)
+    startup_ms = (time.perf_counter() - t0) * 1e3
+    report.CHART_PNG_CACHE.clear()
+    report.CHART_TIMINGS.clear()
+    for phase in ('cold', 'warm'):
+        for label, part in parts:
+            for chart_type in CHART_TYPES:
+                report.create_chart_image(part, chart_type, monthly)
+                report.CHART_TIMINGS[-1].update(label=label, phase=phase)
+    images = list(report.CHART_TIMINGS)
+    for row in images:
+        print(f"  {row['backend']:<10} {row['phase']:<4} {row['label']:<8} {row['chart_type']:<13} "
+              f"{row['ms']:8.1f} ms {row['bytes'] / 1024:7.1f} KiB", file=sys.stderr)
+    return {
+        'requested': name,
+        'backend': backend,
+        'startup_ms': startup_ms,
+        'summary': report.chart_timing_summary().to_dict('records'),
+        'images': images,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description='고지서 차트 래스터화 백엔드 벤치마크')
+    parser.add_argument('--backends', nargs='+', default=list(report.CHART_BACKENDS),
+                        choices=report.CHART_BACKENDS, help='비교할 백엔드 (기본: 전부)')
+    parser.add_argument('--csv', type=Path, default=SOURCE_CSV, help='15분 측정 CSV')
+    parser.add_argument('--months', type=int, default=3, help='그릴 월 수 (앞에서부터)')
+    parser.add_argument('--out', type=Path, help='JSON 저장 경로 (없으면 stdout)')
+    args = parser.parse_args(argv)
+
+    df = load_bill_frame(args.csv)
+    monthly, _ = load_summary(args.csv)
+    parts = split_periods(df)[:args.months]
+    result = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'source': str(args.csv),
+            'months': [label for label, _ in parts],
+        },
+        'backends': [],
+    }
+    for name in args.backends:
+        print(f"[bench] backend={name}", file=sys.stderr)
+        run = bench_backend(name, parts, monthly)
+        if run['backend'] != name:
+            print(f"[bench] {name} 사용 불가 → {run['backend']} 로 측정됨", file=sys.stderr)
+        result['backends'].append(run)
+
+    text = json.dumps(result, ensure_ascii=False, indent=2, default=str)
+    if args.out:
+        args.out.write_text(text, encoding='utf-8')
+        print(f"[bench] → {args.out}", file=sys.stderr)
+    else:
+        print(text)
+    return result
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,10 @@
-import time
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import datetime, time as dt_time, timedelta
+from streaming import ReplayEngine, StreamingSink
+from data_cache import read_typed_csv
 
 # ================================================================================
 # 설정 및 상수 정의
@@ -19,6 +20,14 @@ CHART_RECENT_POINTS = 30
 CHART_HEIGHT = 450
 DATA_LOG_ROWS = 5
 
+# 스트리밍 로그 (CHAPBOT 페이지가 읽음)
+STREAMING_LOG_PATH = '대시보드/data_dash/december_streaming.csv'
+STREAMING_SYNC_EVERY = 1  # n회 append 마다 fsync + 커밋
+
+# 배치 재생 (1행 = 15분)
+MINUTES_PER_ROW = 15
+MAX_ROWS_PER_TICK = 96  # 하루치
+
 # 전력 관련 상수
 BASE_PEAK_POWER = 157.18
 POWER_FACTOR_LAGGING = 90
@@ -306,15 +315,23 @@ st.markdown("""
 # ================================================================================
 @st.cache_data(ttl=3600)
 def load_data():
-    """CSV 데이터 로드 및 전처리 (캐싱 최적화)"""
-    df = pd.read_csv("대시보드/data_dash/test6.csv")
-    df['측정일시'] = pd.to_datetime(df['측정일시'])
-    return df
+    """CSV 데이터 로드 및 전처리 (Parquet 사이드카 + 캐싱)"""
+    df = read_typed_csv("대시보드/data_dash/test6.csv")
+    # 자정 날짜 보정은 로드 시 한 번만 (이후 측정일시는 단조 증가)
+    return fix_midnight_dates(df)
+
+
+@st.cache_resource(show_spinner=False)
+def get_replay_engine():
+    """프로세스 공용 재생 엔진 (모든 세션이 같은 커서/버퍼를 공유)"""
+    data = load_data()
+    sink = StreamingSink(STREAMING_LOG_PATH, data.columns, sync_every=STREAMING_SYNC_EVERY)
+    return ReplayEngine(data, sink)
 
 
 def fix_midnight_dates(df_chart):
     """자정(00:00) 데이터의 날짜를 다음날로 수정"""
-    mask = df_chart['측정일시'].dt.time == pd.Timestamp('00:00:00').time()
+    mask = df_chart['측정일시'].dt.normalize() == df_chart['측정일시']
     if mask.any():
         df_chart.loc[mask, '측정일시'] = df_chart.loc[mask, '측정일시'] + timedelta(days=1)
     return df_chart
@@ -334,20 +351,21 @@ def create_metric_card(label, value, delta, card_class):
 # ================================================================================
 # 최적화된 차트 생성 함수
 # ================================================================================
-def create_power_usage_chart(df, show_peak_line):
-    """전력사용량 라인차트 - 최적화"""
-    df_chart = df.tail(CHART_RECENT_POINTS).copy()
-    df_chart = fix_midnight_dates(df_chart)
-    
-    current_max = df['전력사용량_예측'].max()
-    peak_power = max(BASE_PEAK_POWER, current_max)
-    
-    # 최적화된 차트 생성
+def get_cached_figure(name, builder):
+    """세션별 Figure 골격 캐시 (레이아웃/스타일/기준선은 한 번만 생성)"""
+    figures = st.session_state.setdefault("figures", {})
+    if name not in figures:
+        figures[name] = builder()
+    return figures[name]
+
+
+def build_power_usage_figure(show_peak_line):
+    """전력사용량 라인차트 골격 (데이터 없음)"""
     fig = go.Figure()
     
     fig.add_trace(go.Scatter(
-        x=df_chart['측정일시'],
-        y=df_chart['전력사용량_예측'],
+        x=[],
+        y=[],
         mode='lines+markers',
         name='전력사용량',
         line=dict(color=CHART_COLORS['power'], width=2.5, shape='spline'),
@@ -359,17 +377,15 @@ def create_power_usage_chart(df, show_peak_line):
     
     if show_peak_line:
         fig.add_hline(
-            y=peak_power,
+            y=BASE_PEAK_POWER,
             line_dash="dash",
             line_color="red",
             line_width=2,
-            annotation_text=f"피크: {peak_power:.2f} kWh",
+            annotation_text=f"피크: {BASE_PEAK_POWER:.2f} kWh",
             annotation_position="top right",
             annotation=dict(font_size=11, font_color="red", bgcolor="rgba(255,255,255,0.8)")
         )
     
-    y_max = peak_power * 1.1 if show_peak_line else df_chart['전력사용량_예측'].max() * 1.15
-    
     fig.update_layout(
         height=CHART_HEIGHT,
         margin=dict(l=10, r=10, t=30, b=10),
@@ -383,8 +399,7 @@ def create_power_usage_chart(df, show_peak_line):
             title='전력사용량 (kWh)',
             showgrid=True,
             gridcolor='rgba(0,0,0,0.05)',
-            linecolor='#e0e6ed',
-            range=[0, y_max]
+            linecolor='#e0e6ed'
         ),
         plot_bgcolor='white',
         paper_bgcolor='white',
@@ -397,13 +412,32 @@ def create_power_usage_chart(df, show_peak_line):
     return fig
 
 
-def create_daily_power_gauge(df, latest):
+def create_power_usage_chart(buf, show_peak_line):
+    """전력사용량 라인차트 - 캐시된 골격에 x/y만 교체"""
+    df_chart = buf.tail(CHART_RECENT_POINTS)
+    peak_power = max(BASE_PEAK_POWER, buf.stats.peak_kwh)
+    
+    fig = get_cached_figure(f"power_{show_peak_line}", lambda: build_power_usage_figure(show_peak_line))
+    fig.data[0].update(x=df_chart['측정일시'], y=df_chart['전력사용량_예측'])
+    
+    if show_peak_line:
+        y_max = peak_power * 1.1
+        if fig.layout.shapes[0].y0 != peak_power:
+            fig.layout.shapes[0].update(y0=peak_power, y1=peak_power)
+            fig.layout.annotations[0].update(y=peak_power, text=f"피크: {peak_power:.2f} kWh")
+    else:
+        y_max = df_chart['전력사용량_예측'].max() * 1.15
+    fig.layout.yaxis.range = [0, y_max]
+    
+    return fig
+
+
+def create_daily_power_gauge(stats, latest):
     """당일 전력사용량 게이지 - 최적화 (깜빡임 방지)"""
-    current_date = latest['측정일시'].date()
-    date_str = current_date.strftime('%Y년 %m월 %d일')
+    current_date = stats.last_day
+    date_str = pd.Timestamp(current_date).strftime('%Y년 %m월 %d일')
     
-    df_today = df[df['측정일시'].dt.date == current_date]
-    total_power = df_today['전력사용량_예측'].sum()
+    total_power = stats.day_total(current_date)
     
     current_status = latest['작업휴무']
     config = DAILY_POWER_LIMITS[current_status]
@@ -462,17 +496,14 @@ def create_daily_power_gauge(df, latest):
     return gauge_fig
 
 
-def create_power_factor_chart(df, show_pf_line, latest):
-    """역률 추이 차트 - 최적화"""
-    df_chart_pf = df.tail(CHART_RECENT_POINTS).copy()
-    df_chart_pf = fix_midnight_dates(df_chart_pf)
-    
+def build_power_factor_figure(show_pf_line):
+    """역률 추이 차트 골격 (데이터 없음, 기준선 2개는 시간대에 따라 표시 전환)"""
     fig = go.Figure()
     
     # 지상역률
     fig.add_trace(go.Scatter(
-        x=df_chart_pf['측정일시'],
-        y=df_chart_pf['지상역률(%)'],
+        x=[],
+        y=[],
         mode='lines+markers',
         name='지상역률',
         line=dict(color=CHART_COLORS['lagging_pf'], width=2.5, shape='spline'),
@@ -482,8 +513,8 @@ def create_power_factor_chart(df, show_pf_line, latest):
     
     # 진상역률
     fig.add_trace(go.Scatter(
-        x=df_chart_pf['측정일시'],
-        y=df_chart_pf['진상역률(%)'],
+        x=[],
+        y=[],
         mode='lines+markers',
         name='진상역률',
         line=dict(color=CHART_COLORS['leading_pf'], width=2.5, shape='spline'),
@@ -492,29 +523,25 @@ def create_power_factor_chart(df, show_pf_line, latest):
     ))
     
     if show_pf_line:
-        time_val = latest['측정일시']
-        time_decimal = time_val.hour + time_val.minute / 60.0
-        
-        if POWER_FACTOR_THRESHOLD_START <= time_decimal < POWER_FACTOR_THRESHOLD_END:
-            fig.add_hline(
-                y=POWER_FACTOR_LAGGING,
-                line_dash="dash",
-                line_color=CHART_COLORS['lagging_pf'],
-                line_width=2,
-                annotation_text=f"기준: {POWER_FACTOR_LAGGING}%",
-                annotation_position="top right",
-                annotation=dict(font_size=11, bgcolor="rgba(255,255,255,0.8)")
-            )
-        else:
-            fig.add_hline(
-                y=POWER_FACTOR_LEADING,
-                line_dash="dash",
-                line_color=CHART_COLORS['leading_pf'],
-                line_width=2,
-                annotation_text=f"기준: {POWER_FACTOR_LEADING}%",
-                annotation_position="top right",
-                annotation=dict(font_size=11, bgcolor="rgba(255,255,255,0.8)")
-            )
+        # shapes/annotations[0]: 지상 기준, [1]: 진상 기준
+        fig.add_hline(
+            y=POWER_FACTOR_LAGGING,
+            line_dash="dash",
+            line_color=CHART_COLORS['lagging_pf'],
+            line_width=2,
+            annotation_text=f"기준: {POWER_FACTOR_LAGGING}%",
+            annotation_position="top right",
+            annotation=dict(font_size=11, bgcolor="rgba(255,255,255,0.8)")
+        )
+        fig.add_hline(
+            y=POWER_FACTOR_LEADING,
+            line_dash="dash",
+            line_color=CHART_COLORS['leading_pf'],
+            line_width=2,
+            annotation_text=f"기준: {POWER_FACTOR_LEADING}%",
+            annotation_position="top right",
+            annotation=dict(font_size=11, bgcolor="rgba(255,255,255,0.8)")
+        )
     
     fig.update_layout(
         height=CHART_HEIGHT,
@@ -552,19 +579,31 @@ def create_power_factor_chart(df, show_pf_line, latest):
     return fig
 
 
-def create_load_clock_chart(latest):
-    """시간대별 부하 차트 - 최적화 (깜빡임 방지)"""
-    current_status = latest['작업휴무']
-    current_time = latest['측정일시'].time()
-    current_hour = current_time.hour
-    current_minute = current_time.minute
+def create_power_factor_chart(buf, show_pf_line, latest):
+    """역률 추이 차트 - 캐시된 골격에 x/y만 교체"""
+    df_chart_pf = buf.tail(CHART_RECENT_POINTS)
     
+    fig = get_cached_figure(f"pf_{show_pf_line}", lambda: build_power_factor_figure(show_pf_line))
+    fig.data[0].update(x=df_chart_pf['측정일시'], y=df_chart_pf['지상역률(%)'])
+    fig.data[1].update(x=df_chart_pf['측정일시'], y=df_chart_pf['진상역률(%)'])
+    
+    if show_pf_line:
+        time_val = latest['측정일시']
+        time_decimal = time_val.hour + time_val.minute / 60.0
+        lagging = POWER_FACTOR_THRESHOLD_START <= time_decimal < POWER_FACTOR_THRESHOLD_END
+        for i, visible in enumerate([lagging, not lagging]):
+            if fig.layout.shapes[i].visible != visible:
+                fig.layout.shapes[i].visible = visible
+                fig.layout.annotations[i].visible = visible
+    
+    return fig
+
+
+def build_load_clock_figure(current_status):
+    """시간대별 부하 시계 배경 (세그먼트/라벨/바늘 자리) - 상태별 1회 생성"""
     load_segments = LOAD_SEGMENTS_WORKING if current_status == '가동' else LOAD_SEGMENTS_HOLIDAY
     status_display = '가동일' if current_status == '가동' else '휴무일'
     
-    # 깜빡임 방지: 시간별 uirevision
-    ui_revision = f"load_{current_status}_{current_hour}"
-    
     fig_load = go.Figure()
     load_types = {'경부하': True, '중간부하': True, '최대부하': True}
     
@@ -610,13 +649,10 @@ def create_load_clock_chart(latest):
         hoverinfo='skip'
     ))
     
-    # 시계바늘
-    time_in_hours = current_hour + current_minute / 60.0
-    needle_theta = time_in_hours * 15
-    
+    # 시계바늘 (각도는 매 틱 갱신)
     fig_load.add_trace(go.Scatterpolar(
         r=[0, 0.8],
-        theta=[needle_theta, needle_theta],
+        theta=[0, 0],
         mode='lines',
         line=dict(color='#2C3E50', width=3),
         showlegend=False,
@@ -659,23 +695,40 @@ def create_load_clock_chart(latest):
         height=CHART_HEIGHT,
         margin=dict(l=10, r=10, t=70, b=30),
         paper_bgcolor='white',
-        uirevision=ui_revision,
         transition={'duration': 0}
     )
     
     return fig_load
 
 
+def create_load_clock_chart(latest):
+    """시간대별 부하 차트 - 캐시된 배경에 시계바늘만 갱신 (깜빡임 방지)"""
+    current_status = latest['작업휴무']
+    current_time = latest['측정일시'].time()
+    current_hour = current_time.hour
+    current_minute = current_time.minute
+    
+    fig_load = get_cached_figure(f"load_{current_status}", lambda: build_load_clock_figure(current_status))
+    
+    # 시계바늘
+    needle_theta = (current_hour + current_minute / 60.0) * 15
+    fig_load.data[-2].theta = [needle_theta, needle_theta]
+    
+    # 깜빡임 방지: 시간별 uirevision
+    fig_load.layout.uirevision = f"load_{current_status}_{current_hour}"
+    
+    return fig_load
+
+
 # ================================================================================
 # 세션 상태 초기화
 # ================================================================================
 def initialize_session_state():
     """세션 상태 초기화"""
     defaults = {
-        "running": False,
-        "step": 0,
-        "accumulated_data": pd.DataFrame(),
-        "data_loaded": False,
+        "engine_running": False,
+        "seen_completed_runs": None,
+        "rendered_has_data": False,
         "prev_show_peak": False,
         "prev_show_pf": False,
         "table_key": 0
@@ -685,6 +738,11 @@ def initialize_session_state():
         st.session_state.setdefault(key, value)
 
 
+def find_seek_position(full_data, target):
+    """target 시각까지의 행 수 (측정일시는 로드 시 자정 보정되어 정렬됨)"""
+    return int(full_data['측정일시'].searchsorted(target, side='right'))
+
+
 # ================================================================================
 # 메인 앱
 # ================================================================================
@@ -695,11 +753,9 @@ st.caption("공장 전력 사용량 실시간 대시보드")
 initialize_session_state()
 ss = st.session_state
 
-# 데이터 로드
-if not ss.data_loaded:
-    with st.spinner('데이터 로딩 중...'):
-        ss.full_data = load_data()
-        ss.data_loaded = True
+# 데이터 로드 (공용 엔진)
+with st.spinner('데이터 로딩 중...'):
+    engine = get_replay_engine()
 
 # ---- 사이드바 ----
 with st.sidebar:
@@ -718,15 +774,46 @@ with st.sidebar:
     
     # 재생 설정
     st.subheader("재생 설정")
-    update_interval = st.slider(
+    # 재생 설정은 공용 엔진에 반영되어 모든 시청자에게 적용된다
+    st.slider(
         "업데이트 간격 (초)",
         min_value=0.1,
         max_value=4.0,
-        value=2.0,
+        value=engine.interval,
         step=0.1,
         key="update_interval",
+        on_change=lambda: engine.configure(interval=ss.update_interval),
         help="데이터 업데이트 주기를 설정합니다"
     )
+    st.slider(
+        "틱당 처리 행 수",
+        min_value=1,
+        max_value=MAX_ROWS_PER_TICK,
+        value=engine.rows_per_tick,
+        step=1,
+        key="rows_per_tick",
+        on_change=lambda: engine.configure(rows_per_tick=ss.rows_per_tick),
+        help="한 번의 업데이트에서 누적할 15분 단위 행 수 (96행 = 하루)"
+    )
+    st.caption(f"시뮬레이션 속도: {engine.rows_per_tick * MINUTES_PER_ROW / engine.interval:,.1f}분/초")
+    
+    with st.expander("시점 이동", expanded=False):
+        data_start = engine.data['측정일시'].min()
+        data_end = engine.data['측정일시'].max()
+        seek_date = st.date_input(
+            "날짜",
+            value=data_start.date(),
+            min_value=data_start.date(),
+            max_value=data_end.date(),
+            key="seek_date"
+        )
+        seek_time = st.time_input(
+            "시각",
+            value=dt_time(12, 0),
+            step=timedelta(minutes=MINUTES_PER_ROW),
+            key="seek_time"
+        )
+        seek = st.button("⏩ 이동", use_container_width=True, help="중간 구간을 한 번에 누적하여 해당 시점으로 이동합니다")
     
     st.divider()
     
@@ -759,7 +846,7 @@ with st.sidebar:
     
     # 상태 표시
     st.divider()
-    if ss.running:
+    if engine.running:
         st.success("🟢 **실행 중**")
     else:
         st.info("⚪ **대기 중**")
@@ -770,48 +857,74 @@ if ss.prev_show_peak != show_peak_line or ss.prev_show_pf != show_pf_line:
     ss.prev_show_peak = show_peak_line
     ss.prev_show_pf = show_pf_line
 
-# 컨트롤 버튼 처리
+# 컨트롤 버튼 처리 (공용 엔진 제어)
 if start:
-    ss.running = True
+    engine.start()
 if stop:
-    ss.running = False
+    engine.stop()
 if reset:
-    ss.running = False
-    ss.step = 0
-    ss.accumulated_data = pd.DataFrame()
-    import os
-    try:
-        if os.path.exists('대시보드/data_dash/december_streaming.csv'):
-            os.remove('대시보드/data_dash/december_streaming.csv')
-    except:
-        pass
+    engine.reset()
     st.rerun()
 
-# ---- 데이터 누적 로직 ----
-if ss.running and ss.step < len(ss.full_data):
-    current_row = ss.full_data.iloc[ss.step:ss.step+1]
-    ss.accumulated_data = pd.concat([ss.accumulated_data, current_row], ignore_index=True)
-    ss.step += 1
-    try:
-        ss.accumulated_data.to_csv('대시보드/data_dash/december_streaming.csv', index=False, encoding='utf-8-sig')
-    except:
-        pass
+if seek:
+    target = pd.Timestamp(datetime.combine(seek_date, seek_time))
+    engine.seek(find_seek_position(engine.data, target))
+
+# 엔진 상태 동기화 (다른 시청자의 조작/재생 완료 감지용)
+if ss.seen_completed_runs is None:
+    ss.seen_completed_runs = engine.completed_runs
+completed = ss.seen_completed_runs != engine.completed_runs
+ss.seen_completed_runs = engine.completed_runs
+ss.engine_running = engine.running
+# start()/seek() 직후에는 엔진 스레드가 아직 첫 행을 넣기 전일 수 있다.
+# 이번 실행이 인트로/대시보드 중 무엇을 그렸는지 남겨 두고 watcher 가 비교한다.
+ss.rendered_has_data = len(engine.buffer) > 0
 
 # ================================================================================
-# 메인 대시보드
+# 실시간 패널 (프래그먼트)
 # ================================================================================
-if len(ss.accumulated_data) > 0:
-    df = ss.accumulated_data.copy()
-    df['탄소배출량_kg'] = df['탄소배출량_예측'] * 1000
-    latest = df.iloc[-1]
-    
-    # === KPI 카드 ===
+# 재생 중에는 각 패널이 update_interval 주기로 스스로 다시 실행된다.
+# 전체 스크립트(CSS, 사이드바 등)는 버튼/위젯 조작 시에만 다시 실행되고
+# 틱 사이에 서버 스레드를 time.sleep 으로 붙잡지 않는다.
+# 커서 전진은 공용 엔진 스레드가 담당하고 패널은 lock 을 잡고 읽기만 한다.
+tick_interval = engine.interval if engine.running else None
+
+
+def live_fragment(func):
+    """재생 중일 때만 주기적으로 자체 갱신되는 프래그먼트"""
+    return st.fragment(run_every=tick_interval)(func)
+
+
+@st.fragment(run_every=engine.interval)
+def engine_watcher():
+    """엔진 재생/정지/완료 상태나 버퍼 유무가 바뀌면 전체 화면 갱신 (화면 출력 없음)"""
+    if (ss.engine_running != engine.running
+            or ss.seen_completed_runs != engine.completed_runs
+            or ss.rendered_has_data != (len(engine.buffer) > 0)):
+        st.rerun()
+
+
+def rerun_if_empty():
+    """engine.lock 안에서 호출: 다른 시청자의 리셋/처음으로 이동으로 버퍼가 비었으면
+    패널을 그리지 않고 전체 화면을 다시 실행 (인트로 화면으로)"""
+    if len(engine.buffer) == 0:
+        st.rerun()
+
+
+@live_fragment
+def kpi_panel():
+    """KPI 카드"""
+    with engine.lock:
+        rerun_if_empty()
+        stats = engine.buffer.stats
+        kwh, won, tco2 = stats.kwh, stats.won, stats.tco2
+        latest = engine.buffer.latest()
     col1, col2, col3, col4 = st.columns(4, gap="medium")
     
     with col1:
         st.markdown(create_metric_card(
             "📊 누적 전력사용량",
-            f"{df['전력사용량_예측'].sum():.2f} kWh",
+            f"{kwh:.2f} kWh",
             f"+{latest['전력사용량_예측']:.2f} kWh",
             "metric-card-blue"
         ), unsafe_allow_html=True)
@@ -819,7 +932,7 @@ if len(ss.accumulated_data) > 0:
     with col2:
         st.markdown(create_metric_card(
             "💰 누적 전기요금",
-            f"{df['전기요금_예측'].sum():,.0f} 원",
+            f"{won:,.0f} 원",
             f"+{latest['전기요금_예측']:,.0f} 원",
             "metric-card-green"
         ), unsafe_allow_html=True)
@@ -827,8 +940,8 @@ if len(ss.accumulated_data) > 0:
     with col3:
         st.markdown(create_metric_card(
             "🌱 누적 탄소배출량",
-            f"{df['탄소배출량_kg'].sum():.2f} kgCO2",
-            f"+{latest['탄소배출량_kg']:.2f} kgCO2",
+            f"{tco2 * 1000:.2f} kgCO2",
+            f"+{latest['탄소배출량_예측'] * 1000:.2f} kgCO2",
             "metric-card-orange"
         ), unsafe_allow_html=True)
     
@@ -841,45 +954,54 @@ if len(ss.accumulated_data) > 0:
             load_text,
             "metric-card-purple"
         ), unsafe_allow_html=True)
-    
-    st.divider()
-    
-    # === 전력사용량 섹션 ===
-    st.subheader("실시간 전력사용량 추이 및 당일 전력사용량")
-    
-    chart_col, gauge_col = st.columns([3, 1], gap="medium")
-    
-    with chart_col:
-        fig_power = create_power_usage_chart(df, show_peak_line)
-        st.plotly_chart(fig_power, use_container_width=True, key="power_chart", config={'displayModeBar': False})
-    
-    with gauge_col:
-        fig_gauge = create_daily_power_gauge(df, latest)
-        st.plotly_chart(fig_gauge, use_container_width=True, key="gauge_chart", config={'displayModeBar': False})
-    
-    st.divider()
-    
-    # === 역률 섹션 ===
-    st.subheader("실시간 역률 추이 및 시간대별 부하")
-    
-    pf_col, load_col = st.columns([3, 1], gap="medium")
-    
-    with pf_col:
-        fig_pf = create_power_factor_chart(df, show_pf_line, latest)
-        st.plotly_chart(fig_pf, use_container_width=True, key="pf_chart", config={'displayModeBar': False})
-    
-    with load_col:
-        fig_load = create_load_clock_chart(latest)
-        st.plotly_chart(fig_load, use_container_width=True, key="load_chart", config={'displayModeBar': False})
-    
-    st.divider()
-    
-    # === 데이터 로그 ===
-    st.subheader("최근 데이터 로그")
-    
-    recent_data = df.tail(DATA_LOG_ROWS)[['측정일시', '작업유형', '작업휴무', '지상역률(%)', '진상역률(%)']].copy()
-    recent_data_full = df.tail(DATA_LOG_ROWS).copy().reset_index(drop=True)
-    recent_data = recent_data.reset_index(drop=True)
+
+
+@live_fragment
+def power_chart_panel(show_peak_line):
+    """실시간 전력사용량 추이"""
+    with engine.lock:
+        rerun_if_empty()
+        fig_power = create_power_usage_chart(engine.buffer, show_peak_line)
+    st.plotly_chart(fig_power, use_container_width=True, key="power_chart", config={'displayModeBar': False})
+
+
+@live_fragment
+def gauge_panel():
+    """당일 전력사용량 게이지"""
+    with engine.lock:
+        rerun_if_empty()
+        fig_gauge = create_daily_power_gauge(engine.buffer.stats, engine.buffer.latest())
+    st.plotly_chart(fig_gauge, use_container_width=True, key="gauge_chart", config={'displayModeBar': False})
+
+
+@live_fragment
+def pf_chart_panel(show_pf_line):
+    """실시간 역률 추이"""
+    with engine.lock:
+        rerun_if_empty()
+        fig_pf = create_power_factor_chart(engine.buffer, show_pf_line, engine.buffer.latest())
+    st.plotly_chart(fig_pf, use_container_width=True, key="pf_chart", config={'displayModeBar': False})
+
+
+@live_fragment
+def load_clock_panel():
+    """시간대별 부하 시계"""
+    with engine.lock:
+        rerun_if_empty()
+        latest = engine.buffer.latest()
+    fig_load = create_load_clock_chart(latest)
+    st.plotly_chart(fig_load, use_container_width=True, key="load_chart", config={'displayModeBar': False})
+
+
+@live_fragment
+def data_log_panel():
+    """최근 데이터 로그 + 진행 상황"""
+    with engine.lock:
+        rerun_if_empty()
+        recent_data_full = engine.buffer.tail(DATA_LOG_ROWS).reset_index(drop=True)
+        step = engine.step
+    recent_data_full['탄소배출량_kg'] = recent_data_full['탄소배출량_예측'] * 1000
+    recent_data = recent_data_full[['측정일시', '작업유형', '작업휴무', '지상역률(%)', '진상역률(%)']]
     
     event = st.dataframe(
         recent_data,
@@ -940,14 +1062,57 @@ if len(ss.accumulated_data) > 0:
     
     # 진행 상태
     st.divider()
-    st.write(f"진행 상황: {ss.step}/{len(ss.full_data)} ({ss.step/len(ss.full_data)*100:.1f}%)")
-    st.progress(ss.step / len(ss.full_data))
+    st.write(f"진행 상황: {step}/{len(engine)} ({step/len(engine)*100:.1f}%)")
+    st.progress(step / len(engine))
+
+
+# ---- 엔진 상태 감시 ----
+engine_watcher()
+
+# ================================================================================
+# 메인 대시보드
+# ================================================================================
+if len(engine.buffer) > 0:
+    # === KPI 카드 ===
+    kpi_panel()
+    
+    st.divider()
+    
+    # === 전력사용량 섹션 ===
+    st.subheader("실시간 전력사용량 추이 및 당일 전력사용량")
+    
+    chart_col, gauge_col = st.columns([3, 1], gap="medium")
+    
+    with chart_col:
+        power_chart_panel(show_peak_line)
+    
+    with gauge_col:
+        gauge_panel()
+    
+    st.divider()
+    
+    # === 역률 섹션 ===
+    st.subheader("실시간 역률 추이 및 시간대별 부하")
+    
+    pf_col, load_col = st.columns([3, 1], gap="medium")
+    
+    with pf_col:
+        pf_chart_panel(show_pf_line)
+    
+    with load_col:
+        load_clock_panel()
+    
+    st.divider()
+    
+    # === 데이터 로그 ===
+    st.subheader("최근 데이터 로그")
+    data_log_panel()
 
 
 else:
     # 초기 화면
     st.info("**사이드바에서 '재생' 버튼을 눌러 모니터링을 시작하세요.**")
-    st.caption(f"데이터가 {ss.get('update_interval', 2.0)}초마다 자동으로 업데이트됩니다.")
+    st.caption(f"데이터가 {engine.interval}초마다 자동으로 업데이트됩니다.")
     
     # 가이드
     with st.expander("사용 가이드", expanded=True):
@@ -970,14 +1135,7 @@ else:
             - **데이터 로그**: 최근 데이터 상세 확인
             """)
 
-# ---- 자동 반복 ----
-if ss.running and ss.step < len(ss.full_data):
-    time.sleep(update_interval)
-    try:
-        st.rerun()
-    except Exception:
-        st.experimental_rerun()
-elif ss.running and ss.step >= len(ss.full_data):
+# ---- 완료 알림 ----
+if completed:
     st.success("✅ 모든 데이터 처리 완료!")
     st.balloons()
-    ss.running = False
\ No newline at end of file
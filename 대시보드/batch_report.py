@@ -0,0 +1,166 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+
+from data_cache import read_typed_csv
+from schema import add_calendar_columns
+
+# ================================================================================
+# 고지서 일괄 생성
+# ================================================================================
+# 고지서 1장은 템플릿 로드 + 차트 2개 래스터화 + DOCX 저장이라 대부분 CPU 시간이다.
+# 연월(또는 사업장 × 연월)별로 나눈 구간을 프로세스 풀에 나눠 렌더하고
+# 결과를 ZIP 하나 또는 docxcompose 로 이어 붙인 DOCX 하나로 묶는다.
+#
+#   python 대시보드/batch_report.py --out 고지서_2024.zip
+#   python 대시보드/batch_report.py --format merged --out 고지서_2024.docx --workers 4
+
+DASH = Path(__file__).resolve().parent
+SOURCE_CSV = DASH / 'data_dash' / 'train_dash_df.csv'
+TEMPLATE_PATH = DASH / 'data_dash' / '고지서_템플릿.docx'
+
+OUTPUT_FORMATS = ('zip', 'merged')
+
+# 워커는 spawn 으로 띄운다. 멀티스레드인 Streamlit 서버에서 fork 하면 잡혀 있던
+# lock(BoundedLRU, 차트 백엔드/폰트 초기화)과 이미 고른 차트 백엔드(kaleido 상주 스레드는
+# fork 후 살아있지 않음)까지 복사되므로, 워커는 report 를 새로 import 해 스스로 초기화한다.
+MP_START_METHOD = 'spawn'
+
+# 기본 구간: 연 × 월. 월만으로 나누면 여러 해의 같은 달(예: 12월)이 한 고지서로 합쳐지고
+# ZIP 안 파일명도 겹친다.
+DEFAULT_BY = ('year', 'month')
+PERIOD_LABELS = {'year': '{}년', 'month': '{:02d}월'}
+
+
+def split_periods(df: pd.DataFrame, by=DEFAULT_BY) -> list:
+    """by 컬럼 값별 (라벨, 부분 프레임) 목록 (값 순서대로, 라벨 예: 2024년_12월)"""
+    by = [by] if isinstance(by, str) else list(by)
+    parts = []
+    for key, part in df.groupby(by, observed=True, sort=True):
+        key = key if isinstance(key, tuple) else (key,)
+        label = '_'.join(PERIOD_LABELS[col].format(int(v)) if col in PERIOD_LABELS else str(v)
+                         for col, v in zip(by, key))
+        parts.append((label, part))
+    return parts
+
+
+def bill_filename(label: str) -> str:
+    """분석 페이지 다운로드와 같은 규칙의 파일명"""
+    return f"LS일렉트릭_전기요금_고지서_{label}.docx"
+
+
+def _render_part(label: str, part: pd.DataFrame, template_path: str, monthly) -> tuple:
+    """워커: 한 구간 렌더 → (라벨, DOCX 바이트 또는 None)"""
+    from report import render_report
+
+    return label, render_report(part, template_path, monthly)
+
+
+def render_batch(parts, template_path=TEMPLATE_PATH, monthly=None, max_workers=None,
+                 progress=None) -> list:
+    """
+    구간별 고지서를 프로세스 풀에서 렌더 → [(라벨, DOCX 바이트)] (입력 순서 유지, 빈 구간 제외).
+    progress(done, total, label) 는 구간 하나가 끝날 때마다 호출 (호출한 스레드에서 실행).
+    """
+    parts = list(parts)
+    total = len(parts)
+    if max_workers is None:
+        max_workers = min(total, os.cpu_count() or 1)
+    results = {}
+    if max_workers <= 1:
+        for done, (label, part) in enumerate(parts, 1):
+            results[label] = _render_part(label, part, str(template_path), monthly)[1]
+            if progress:
+                progress(done, total, label)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=multiprocessing.get_context(MP_START_METHOD)) as pool:
+            futures = [pool.submit(_render_part, label, part, str(template_path), monthly)
+                       for label, part in parts]
+            for done, future in enumerate(as_completed(futures), 1):
+                label, data = future.result()
+                results[label] = data
+                if progress:
+                    progress(done, total, label)
+    return [(label, results[label]) for label, _ in parts if results.get(label)]
+
+
+def to_zip(bills) -> bytes:
+    """[(라벨, DOCX)] → ZIP 바이트 (DOCX 는 이미 압축돼 있어 저장만)"""
+    buf = BytesIO()
+    with zipfile.ZipFile(buf, 'w', compression=zipfile.ZIP_STORED) as zf:
+        for label, data in bills:
+            zf.writestr(bill_filename(label), data)
+    return buf.getvalue()
+
+
+def to_merged_docx(bills) -> bytes:
+    """[(라벨, DOCX)] → 페이지 나눔으로 이어 붙인 DOCX 하나 (docxcompose)"""
+    from docx import Document
+    from docxcompose.composer import Composer
+
+    if not bills:
+        raise ValueError("합칠 고지서가 없습니다.")
+    master = Document(BytesIO(bills[0][1]))
+    composer = Composer(master)
+    for _, data in bills[1:]:
+        master.add_page_break()
+        composer.append(Document(BytesIO(data)))
+    buf = BytesIO()
+    composer.save(buf)
+    return buf.getvalue()
+
+
+def generate_batch(df: pd.DataFrame, template_path=TEMPLATE_PATH, by=DEFAULT_BY, monthly=None,
+                   output: str = 'zip', max_workers=None, progress=None) -> bytes:
+    """by 구간별 고지서 일괄 생성 → ZIP 또는 합친 DOCX 바이트"""
+    if output not in OUTPUT_FORMATS:
+        raise ValueError(f"output 은 {OUTPUT_FORMATS} 중 하나여야 합니다: {output!r}")
+    bills = render_batch(split_periods(df, by), template_path, monthly, max_workers, progress)
+    return to_zip(bills) if output == 'zip' else to_merged_docx(bills)
+
+
+def load_bill_frame(csv_path=SOURCE_CSV) -> pd.DataFrame:
+    """고지서용 원본 로드 (분석 페이지 load_data 와 같은 dtype 정책 / 파생 컬럼)"""
+    df = add_calendar_columns(read_typed_csv(csv_path))
+    if '단가' in df.columns:
+        df = df.dropna(subset=['단가'])
+    return df.sort_values('측정일시', kind='stable').reset_index(drop=True)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='월별(또는 사업장별) 전기요금 고지서 일괄 생성')
+    parser.add_argument('--csv', type=Path, default=SOURCE_CSV, help='15분 측정 CSV')
+    parser.add_argument('--template', type=Path, default=TEMPLATE_PATH, help='고지서 DOCX 템플릿')
+    parser.add_argument('--by', nargs='+', default=list(DEFAULT_BY),
+                        help='구간 컬럼 (기본: year month, 예: 사업장 year month)')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='zip', help='ZIP 또는 합친 DOCX')
+    parser.add_argument('--workers', type=int, help='프로세스 수 (기본: CPU 수, 1 이면 순차)')
+    parser.add_argument('--out', type=Path, required=True, help='저장 경로')
+    args = parser.parse_args(argv)
+
+    from summary import load_summary
+
+    df = load_bill_frame(args.csv)
+    monthly, _ = load_summary(args.csv)
+    started = time.perf_counter()
+
+    def report_progress(done, total, label):
+        print(f"[batch_report] {done}/{total} {label}", file=sys.stderr)
+
+    data = generate_batch(df, args.template, args.by, monthly, args.format, args.workers, report_progress)
+    args.out.write_bytes(data)
+    print(f"[batch_report] → {args.out} ({len(data) / 1024:,.0f} KiB, "
+          f"{time.perf_counter() - started:.1f}s)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+import numpy as np
+import pandas as pd
+
+# ================================================================================
+# 전력 데이터 OLAP 큐브
+# ================================================================================
+# 탭마다 원본 15분 행을 월/일/시/작업유형/작업휴무로 다시 groupby 하지 않도록
+# 로드 시점에 (date × hour × 작업유형 × 작업휴무) 단위로 한 번 집계해 두고
+# 차트/KPI는 이 큐브의 roll-up 으로 계산한다. 한 시간의 15분 측정 4건이 한 셀로
+# 합쳐지므로 roll-up 비용은 원본 행 수의 약 1/4 에 비례한다.
+# 하루 주기(15분 슬롯) 프로파일과 공회전 엔진은 15분 해상도가 필요하므로
+# 측정값을 줄인 (date × slot × 작업휴무) 슬롯 테이블을 따로 둔다.
+# 두 테이블 모두 date 순으로 정렬되어 있으므로 기간 필터는 searchsorted 슬라이스로 끝난다.
+
+DIMS = ['date', 'hour', '작업유형', '작업휴무']
+SLOT_DIMS = ['date', 'slot', '작업휴무']
+
+# 큐브 컬럼명 → 원본 컬럼명 (원본에 없는 측정값은 0으로 채움)
+MEASURES = {
+    'kwh': '전력사용량(kWh)',
+    'won': '전기요금(원)',
+    'lag_kvarh': '지상무효전력량(kVarh)',
+    'lead_kvarh': '진상무효전력량(kVarh)',
+    'tco2': '탄소배출량(tCO2)',
+    'lag_pf': '지상역률(%)',
+    'lead_pf': '진상역률(%)',
+}
+
+# 역률 0은 미측정 구간이므로 양수만 모은 합계/건수를 따로 둠
+PF_MEASURES = ('lag_pf', 'lead_pf')
+
+SUM_COLS = [*MEASURES, *(f'{m}_pos' for m in PF_MEASURES),
+            *(f'{m}_cnt' for m in PF_MEASURES), 'n']
+
+# 슬롯 테이블 측정값 (하루 주기 프로파일 / 공회전 엔진용)
+SLOT_MEASURES = ('kwh', 'won', 'lag_pf', 'lead_pf')
+
+# 하루 15분 슬롯 (slot = hour * 4 + quarter, 0..95)
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+
+def _with_calendar(table: pd.DataFrame) -> pd.DataFrame:
+    table = table.reset_index()
+    table['year'] = table['date'].dt.year.astype('int16')
+    table['month'] = table['date'].dt.month.astype('int8')
+    return table
+
+
+def build_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """원본 15분 데이터 → 시간 단위 큐브 (합계는 누적 오차를 피하려고 float64 로 보관)"""
+    dt = df['측정일시']
+    base = pd.DataFrame({
+        'date': dt.dt.normalize(),
+        'hour': dt.dt.hour.astype('int8'),
+        '작업유형': df['작업유형'].astype('category'),
+        '작업휴무': df['작업휴무'].astype('category'),
+    })
+    for name, col in MEASURES.items():
+        base[name] = df[col].to_numpy(dtype='float64') if col in df.columns else 0.0
+    for name in PF_MEASURES:
+        pos = base[name] > 0
+        base[f'{name}_pos'] = base[name].where(pos, 0.0)
+        base[f'{name}_cnt'] = pos.astype('int32')
+
+    grouped = base.groupby(DIMS, observed=True, sort=True)
+    cube = grouped[SUM_COLS[:-1]].sum()
+    cube['n'] = grouped.size().astype('int32')
+    cube['kwh_min'] = grouped['kwh'].min()
+    cube['kwh_max'] = grouped['kwh'].max()
+    return _with_calendar(cube)
+
+
+def build_slot_table(df: pd.DataFrame) -> pd.DataFrame:
+    """원본 15분 데이터 → (date × slot × 작업휴무) 합계 / 건수 (hour = slot // 4)"""
+    dt = df['측정일시']
+    base = pd.DataFrame({
+        'date': dt.dt.normalize(),
+        'slot': (dt.dt.hour * 4 + dt.dt.minute // SLOT_MINUTES).astype('int8'),
+        '작업휴무': df['작업휴무'].astype('category'),
+    })
+    for name in SLOT_MEASURES:
+        col = MEASURES[name]
+        base[name] = df[col].to_numpy(dtype='float64') if col in df.columns else 0.0
+
+    grouped = base.groupby(SLOT_DIMS, observed=True, sort=True)
+    slots = grouped[list(SLOT_MEASURES)].sum()
+    slots['n'] = grouped.size().astype('int32')
+    slots = _with_calendar(slots)
+    slots['hour'] = (slots['slot'] // 4).astype('int8')
+    return slots
+
+
+def slice_cube(cube: pd.DataFrame, start=None, end=None, month: int | None = None,
+               work_status: str | None = None) -> pd.DataFrame:
+    """기간 [start, end] (일 단위) / 월 / 작업휴무로 큐브(또는 슬롯 테이블) 부분 선택"""
+    dates = cube['date'].to_numpy()
+    lo, hi = 0, len(cube)
+    if start is not None:
+        lo = int(np.searchsorted(dates, np.datetime64(str(start), 'D').astype(dates.dtype), 'left'))
+    if end is not None:
+        hi = int(np.searchsorted(dates, np.datetime64(str(end), 'D').astype(dates.dtype), 'right'))
+    out = cube.iloc[lo:hi]
+    if month is not None:
+        out = out[out['month'].to_numpy() == month]
+    if work_status not in (None, '전체'):
+        out = out[out['작업휴무'].to_numpy() == work_status]
+    return out
+
+
+def _with_means(table):
+    n = table['n'].where(table['n'] > 0)
+    for name in MEASURES:
+        table[f'{name}_mean'] = (table[name] / n).fillna(0.0)
+    for name in PF_MEASURES:
+        cnt = table[f'{name}_cnt'].where(table[f'{name}_cnt'] > 0)
+        table[f'{name}_pos_mean'] = (table[f'{name}_pos'] / cnt).fillna(0.0)
+    return table
+
+
+def rollup(cube: pd.DataFrame, by) -> pd.DataFrame:
+    """by 차원으로 roll-up (합계 / 건수 / 평균 / kWh 최소·최대)"""
+    grouped = cube.groupby(by, observed=True, sort=True)
+    table = grouped[SUM_COLS].sum()
+    table['kwh_min'] = grouped['kwh_min'].min()
+    table['kwh_max'] = grouped['kwh_max'].max()
+    return _with_means(table).reset_index()
+
+
+def totals(cube: pd.DataFrame) -> pd.Series:
+    """전체 합계 roll-up"""
+    table = cube[SUM_COLS].sum().to_frame().T
+    table['kwh_min'] = cube['kwh_min'].min() if len(cube) else 0.0
+    table['kwh_max'] = cube['kwh_max'].max() if len(cube) else 0.0
+    return _with_means(table).iloc[0]
+
+
+# ================================================================================
+# 하루 주기 프로파일
+# ================================================================================
+# 슬롯 라벨("HH:MM")은 한 번만 만들어 두고, 프로파일은 정수 슬롯 코드에 대한
+# np.bincount 로 계산한다 (문자열 키 groupby / 행별 apply 없음).
+
+_SLOT_LABELS = {}
+
+
+def slot_labels(minutes: int = SLOT_MINUTES) -> pd.Index:
+    """minutes 간격 하루 슬롯 라벨 (캐시된 룩업)"""
+    if minutes not in _SLOT_LABELS:
+        _SLOT_LABELS[minutes] = pd.Index(
+            [f"{m // 60:02d}:{m % 60:02d}" for m in range(0, 24 * 60, minutes)]
+        )
+    return _SLOT_LABELS[minutes]
+
+
+def cycle_profile(cube: pd.DataFrame, measures, by: str | None = '작업휴무',
+                  minutes: int = SLOT_MINUTES) -> pd.DataFrame:
+    """by 값별 하루 주기 평균 프로파일 (measure 합계 / 측정 건수, 관측된 슬롯만)
+
+    cube 는 slot 컬럼이 있는 슬롯 테이블(build_slot_table)
+
+    반환 컬럼: by, slot, minute_of_day, time_label(categorical), <measure>_mean, n
+    """
+    step = minutes // SLOT_MINUTES
+    n_bins = SLOTS_PER_DAY // step
+    labels = slot_labels(minutes)
+    slot = cube['slot'].to_numpy().astype(np.intp) // step
+    n = cube['n'].to_numpy()
+
+    if by is None:
+        groups = [(None, np.ones(len(cube), dtype=bool))]
+    else:
+        keys = cube[by].to_numpy()
+        groups = [(key, keys == key) for key in pd.unique(keys)]
+        if isinstance(cube[by].dtype, pd.CategoricalDtype):
+            order = list(cube[by].cat.categories)
+            groups.sort(key=lambda g: order.index(g[0]))
+
+    frames = []
+    for key, mask in groups:
+        cnt = np.bincount(slot[mask], weights=n[mask], minlength=n_bins)
+        seen = np.flatnonzero(cnt > 0)
+        frame = {} if by is None else {by: np.repeat(key, len(seen))}
+        frame['slot'] = seen
+        frame['minute_of_day'] = seen * minutes
+        frame['time_label'] = pd.Categorical.from_codes(seen, categories=labels)
+        for m in measures:
+            sums = np.bincount(slot[mask], weights=cube[m].to_numpy()[mask], minlength=n_bins)
+            frame[f'{m}_mean'] = sums[seen] / cnt[seen]
+        frame['n'] = cnt[seen].astype(np.int64)
+        frames.append(pd.DataFrame(frame))
+    if not frames:
+        return pd.DataFrame(columns=[*([] if by is None else [by]), 'slot', 'minute_of_day',
+                                     'time_label', *(f'{m}_mean' for m in measures), 'n'])
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,119 @@
+import hashlib
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from schema import CATEGORY_COLS, DATETIME_COLS, SCHEMA_VERSION, compact_frame
+
+# ================================================================================
+# 타입 지정 Parquet 사이드카
+# ================================================================================
+# 한글 헤더 CSV를 매번 파싱하고 측정일시 문자열을 pd.to_datetime 으로 변환하는 비용을
+# 콜드 스타트/캐시 만료 때마다 치르지 않도록, 변환이 끝난 결과(dtype 정책은 schema.py)를 CSV 옆에
+# <이름>.parquet 로 저장해 두고 원본 CSV가 바뀌었을 때만 다시 만든다.
+
+_META_MTIME = b'source_mtime_ns'
+_META_SIZE = b'source_size'
+_META_SHA1 = b'source_sha1'
+_META_SCHEMA = b'schema_version'
+
+
+def sidecar_path(csv_path) -> Path:
+    """CSV 옆 Parquet 사이드카 경로"""
+    csv_path = Path(csv_path)
+    return csv_path.with_suffix('.parquet')
+
+
+def file_sha1(path) -> str:
+    h = hashlib.sha1()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _sidecar_is_fresh(csv_path: Path, pq_path: Path, st_csv, version: str = SCHEMA_VERSION) -> bool:
+    import pyarrow.parquet as pq
+
+    meta = pq.read_schema(pq_path).metadata or {}
+    if meta.get(_META_SCHEMA) != version.encode():
+        return False  # dtype 정책이 바뀌면 재생성
+    if (meta.get(_META_MTIME) == str(st_csv.st_mtime_ns).encode()
+            and meta.get(_META_SIZE) == str(st_csv.st_size).encode()):
+        return True
+    # mtime만 바뀐 경우(git checkout 등)는 내용 해시로 재확인
+    return meta.get(_META_SHA1) == file_sha1(csv_path).encode()
+
+
+def _write_sidecar(df: pd.DataFrame, csv_path: Path, pq_path: Path, st_csv,
+                   version: str = SCHEMA_VERSION):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    meta = dict(table.schema.metadata or {})
+    meta.update({
+        _META_MTIME: str(st_csv.st_mtime_ns).encode(),
+        _META_SIZE: str(st_csv.st_size).encode(),
+        _META_SHA1: file_sha1(csv_path).encode(),
+        _META_SCHEMA: version.encode(),
+    })
+    tmp = pq_path.with_name(pq_path.name + '.tmp')
+    pq.write_table(table.replace_schema_metadata(meta), tmp)
+    os.replace(tmp, pq_path)
+
+
+def read_typed_csv(csv_path, datetime_cols=DATETIME_COLS,
+                   category_cols=CATEGORY_COLS) -> pd.DataFrame:
+    """타입 지정 CSV 로드 (유효한 Parquet 사이드카가 있으면 그것을 읽음)"""
+    csv_path = Path(csv_path)
+    pq_path = sidecar_path(csv_path)
+    st_csv = csv_path.stat()
+
+    try:
+        if pq_path.exists() and _sidecar_is_fresh(csv_path, pq_path, st_csv):
+            return pd.read_parquet(pq_path)
+    except Exception as e:
+        print(f"[data_cache] 사이드카 읽기 실패, CSV로 재생성: {e}", file=sys.stderr)
+
+    df = compact_frame(pd.read_csv(csv_path), datetime_cols, category_cols)
+    try:
+        _write_sidecar(df, csv_path, pq_path, st_csv)
+    except Exception as e:
+        # pyarrow 미설치 / 읽기 전용 배포 환경 등 → CSV 결과만 사용
+        print(f"[data_cache] 사이드카 저장 실패: {e}", file=sys.stderr)
+    return df
+
+
+# ================================================================================
+# 파생 테이블 사이드카
+# ================================================================================
+# 원본 CSV에서 만든 요약 테이블도 같은 방식으로 <이름>.<name>.parquet 에 저장하고
+# 원본 CSV(또는 파생 테이블 버전)가 바뀌었을 때만 다시 만든다.
+
+def derived_path(csv_path, name: str) -> Path:
+    """CSV 옆 파생 테이블 경로"""
+    return Path(csv_path).with_suffix(f'.{name}.parquet')
+
+
+def read_derived(csv_path, name: str, build, version: str) -> pd.DataFrame:
+    """파생 테이블 로드 (사이드카가 유효하면 읽고, 아니면 build() 결과를 저장 후 반환)"""
+    csv_path = Path(csv_path)
+    pq_path = derived_path(csv_path, name)
+    st_csv = csv_path.stat()
+    version = f'{SCHEMA_VERSION}.{version}'
+
+    try:
+        if pq_path.exists() and _sidecar_is_fresh(csv_path, pq_path, st_csv, version):
+            return pd.read_parquet(pq_path)
+    except Exception as e:
+        print(f"[data_cache] {name} 사이드카 읽기 실패, 재생성: {e}", file=sys.stderr)
+
+    df = build()
+    try:
+        _write_sidecar(df, csv_path, pq_path, st_csv, version)
+    except Exception as e:
+        print(f"[data_cache] {name} 사이드카 저장 실패: {e}", file=sys.stderr)
+    return df
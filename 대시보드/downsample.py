@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+# ================================================================================
+# 장기간 차트 다운샘플링
+# ================================================================================
+# 일별 차트는 기간이 길수록(전체 기간 / 여러 해 데이터) 일 수만큼의 점을 그대로
+# 브라우저로 보낸다. 점 개수가 예산을 넘으면
+#   - 막대: 일 → 주 → 월 단위 합계로 묶고
+#   - 선  : LTTB(Largest-Triangle-Three-Buckets)로 모양을 유지하며 점을 줄이고
+#   - 남은 점이 많으면 SVG Scatter 대신 WebGL Scattergl 로 그린다.
+
+BAR_POINT_BUDGET = 120
+LINE_POINT_BUDGET = 1500
+WEBGL_THRESHOLD = 500
+
+# 묶음 단위 (pandas 주기 → 표시 이름)
+BUCKETS = {'D': '일', 'W': '주', 'M': '월'}
+
+
+def bar_bucket(n_days: int, budget: int = BAR_POINT_BUDGET) -> str:
+    """일 수 → 막대 묶음 단위 ('D' / 'W' / 'M', 예산 안에 드는 가장 작은 단위)"""
+    if n_days <= budget:
+        return 'D'
+    if -(-n_days // 7) <= budget:
+        return 'W'
+    return 'M'
+
+
+def bucket_sum(frame: pd.DataFrame, date_col: str, freq: str) -> pd.DataFrame:
+    """date_col 기준 주/월 합계 (date_col 은 구간 시작일로 바뀜, 'D' 면 그대로)"""
+    if freq == 'D' or frame.empty:
+        return frame
+    start = pd.to_datetime(frame[date_col]).dt.to_period(freq).dt.start_time
+    return (
+        frame.drop(columns=date_col)
+        .groupby(start.rename(date_col), sort=True)
+        .sum(numeric_only=True)
+        .reset_index()
+    )
+
+
+def bucket_labels(dates, freq: str) -> pd.Index:
+    """x축 범주 라벨 (월: YYYY-MM / 주: 시작일~ / 일: MM-DD, 여러 해면 YY-MM-DD)"""
+    dates = pd.DatetimeIndex(pd.to_datetime(dates))
+    if freq == 'M':
+        return dates.strftime('%Y-%m')
+    fmt = '%y-%m-%d' if dates.year.nunique() > 1 else '%m-%d'
+    labels = dates.strftime(fmt)
+    return labels + '~' if freq == 'W' else labels
+
+
+def lttb_indices(y, n_out: int = LINE_POINT_BUDGET, x=None) -> np.ndarray:
+    """LTTB 로 고른 점 위치 (처음/끝 포함, 오름차순 / 점이 예산 이하면 전체)"""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    # 양 끝을 뺀 1..n-2 를 n_out-2 개 버킷으로 나누고 버킷마다 한 점씩 고름
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    out = np.empty(n_out, dtype=np.intp)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = (hi, edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        # 직전 선택점(a) - 후보 - 다음 버킷 평균이 이루는 삼각형 넓이가 최대인 후보
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def use_webgl(n_points: int, threshold: int = WEBGL_THRESHOLD) -> bool:
+    """점 개수가 임계값을 넘으면 WebGL(Scattergl) 사용"""
+    return n_points > threshold
@@ -0,0 +1,283 @@
+import numpy as np
+import pandas as pd
+
+from schema import is_night
+
+# ================================================================================
+# 공회전(idle) 에너지 증분 엔진
+# ================================================================================
+# 필터가 바뀔 때마다 선택 구간 전체에서 30% 분위수 베이스라인과 일별 손실표를
+# 다시 계산하지 않도록, 일 단위로 들어오는 데이터를 한 번씩만 처리해
+# 일별 손실/비용을 누적해 둔다. 베이스라인은 (월, 작업휴무)별로 잡고
+# 같은 달의 날짜는 모두 같은 베이스라인으로 평가한다.
+#   - 진행 중인 달: P² 분위수 스케치(하루치를 한 번에 갱신)의 월 누계 추정값.
+#     일별 손실표를 만들 때 그 달의 모든 날을 현재 추정값 하나로 평가한다.
+#   - 끝난 달(다음 달 데이터가 들어온 달): 보관해 둔 그 달 측정값의 정확한 분위수로
+#     한 번 확정하고 일별 행을 다시 평가한 뒤 측정값은 버린다.
+# 비용: add_day 는 그 날 측정값 수에 비례 (스케치 갱신은 측정값 1건당 O(1)).
+# 진행 중인 달은 확정용으로 원 측정값을 들고 있고, 베이스라인 추정값이 날마다 바뀌므로
+# daily() 는 새 날이 들어온 뒤 처음 호출될 때 진행 중인 달의 모든 날을 다시 평가한다
+# — 진행 중인 달 측정값 수(최대 한 달치)에 비례하는 O(days-in-open-month).
+# 끝난 달의 행은 확정 후 다시 평가하지 않는다.
+#   - 가동일: 야간(22:00~08:00) 측정값만 베이스라인 / 손실 대상
+#   - 휴무일: 전체 시간대가 베이스라인 / 손실 대상
+
+BASELINE_Q = 0.3
+
+
+def _p2_adjust(qm, qi, qp, nm, ni, np_, d):
+    """가운데 마커 한 칸 이동 후 높이 (포물선 보간, 순서가 깨지면 선형 보간)"""
+    q = qi + d / (np_ - nm) * ((ni - nm + d) * (qp - qi) / (np_ - ni)
+                               + (np_ - ni - d) * (qi - qm) / (ni - nm))
+    if qm < q < qp:
+        return q
+    return qi + d * (qp - qi) / (np_ - ni) if d > 0 else qi - (qm - qi) / (nm - ni)
+
+
+class P2Quantile:
+    """P² 분위수 추정기 (Jain & Chlamtac, 마커 5개 — 측정값 1건당 갱신 O(1), 원 측정값은 보관 안 함)"""
+
+    def __init__(self, p: float):
+        self.p = float(p)
+        self.count = 0
+        self._init = []
+        self._q = None
+
+    def update(self, x: float):
+        x = float(x)
+        self.count += 1
+        if self._q is None:
+            self._init.append(x)
+            if len(self._init) == 5:
+                p = self.p
+                self._q = sorted(self._init)
+                self._n = [0, 1, 2, 3, 4]
+                self._np = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+                self._dn = [0, p / 2, p, (1 + p) / 2, 1]
+            return
+
+        q, n = self._q, self._n
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._np[i] += self._dn[i]
+
+        for i in (1, 2, 3):
+            d = self._np[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                qp = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < qp < q[i + 1]:
+                    qp = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = qp
+                n[i] += d
+
+    def update_many(self, xs):
+        """측정값 배열을 순서대로 반영 (update 와 같은 결과, 마커 상태를 지역 변수로 두고 갱신)"""
+        xs = np.asarray(xs, dtype=float).tolist()
+        i = 0
+        while self._q is None and i < len(xs):
+            self.update(xs[i])
+            i += 1
+        if i == len(xs):
+            return
+
+        q0, q1, q2, q3, q4 = self._q
+        n0, n1, n2, n3, n4 = self._n
+        d0, d1, d2, d3, d4 = self._np
+        _, dn1, dn2, dn3, dn4 = self._dn
+        for x in xs[i:]:
+            if x < q1:
+                if x < q0:
+                    q0 = x
+                n1 += 1
+                n2 += 1
+                n3 += 1
+            elif x < q2:
+                n2 += 1
+                n3 += 1
+            elif x < q3:
+                n3 += 1
+            elif x >= q4:
+                q4 = x
+            n4 += 1
+            d1 += dn1
+            d2 += dn2
+            d3 += dn3
+            d4 += dn4
+
+            d = d1 - n1
+            if (d >= 1 and n2 - n1 > 1) or (d <= -1 and n0 - n1 < -1):
+                d = 1 if d > 0 else -1
+                q1 = _p2_adjust(q0, q1, q2, n0, n1, n2, d)
+                n1 += d
+            d = d2 - n2
+            if (d >= 1 and n3 - n2 > 1) or (d <= -1 and n1 - n2 < -1):
+                d = 1 if d > 0 else -1
+                q2 = _p2_adjust(q1, q2, q3, n1, n2, n3, d)
+                n2 += d
+            d = d3 - n3
+            if (d >= 1 and n4 - n3 > 1) or (d <= -1 and n2 - n3 < -1):
+                d = 1 if d > 0 else -1
+                q3 = _p2_adjust(q2, q3, q4, n2, n3, n4, d)
+                n3 += d
+
+        self._q = [q0, q1, q2, q3, q4]
+        self._n = [n0, n1, n2, n3, n4]
+        self._np = [d0, d1, d2, d3, d4]
+        self.count += len(xs) - i
+
+    def value(self) -> float:
+        """현재 분위수 추정값 (5개 미만이면 정확한 값)"""
+        if self._q is None:
+            return float(np.quantile(self._init, self.p)) if self._init else 0.0
+        return self._q[2]
+
+
+class _OpenMonth:
+    """진행 중인 (월, 작업휴무) — P² 월 누계 스케치 + 재평가용 일별 대상 측정값"""
+
+    def __init__(self, q: float):
+        self.sketch = P2Quantile(q)
+        self.days = []   # (date, 대상 kWh, 대상 요금)
+
+
+def _score(kwh, won, baseline: float) -> tuple:
+    """대상 측정값 → (공회전 손실 kWh, 손실 비용)"""
+    idle = np.clip(kwh - baseline, 0, None)
+    cost = np.divide(won * idle, kwh, out=np.zeros_like(idle), where=kwh != 0)
+    return float(idle.sum()), float(cost.sum())
+
+
+class IdleEngine:
+    """일 단위 공회전 손실 / 비용 누적 + 월별 베이스라인 (진행 중: P² 스케치, 끝난 달: 확정값)"""
+
+    COLUMNS = ['date', 'type', 'loss', 'cost', 'baseline']
+
+    def __init__(self, q: float = BASELINE_Q):
+        self.q = q
+        self.last_day = None
+        self._open = {}        # (year, month, 작업휴무) -> _OpenMonth
+        self._baselines = {}   # (year, month, 작업휴무) -> 끝난 달의 확정 베이스라인
+        self._rows = []        # 끝난 달의 일별 행
+        self._frame = None
+
+    def __len__(self):
+        return len(self._rows) + sum(len(m.days) for m in self._open.values())
+
+    def month_baseline(self, year: int, month: int, status: str) -> float:
+        """해당 월 베이스라인 (끝난 달은 확정값, 진행 중이면 월 누계 추정값, 없으면 0)"""
+        key = (year, month, status)
+        if key in self._baselines:
+            return self._baselines[key]
+        open_month = self._open.get(key)
+        return open_month.sketch.value() if open_month is not None else 0.0
+
+    def _close_before(self, year: int, month: int):
+        """(year, month) 이전의 진행 중인 달을 확정: 정확한 분위수로 그 달의 날을 다시 평가"""
+        for key in sorted(k for k in self._open if k[:2] < (year, month)):
+            days = self._open.pop(key).days
+            readings = np.concatenate([kwh for _, kwh, _ in days])
+            baseline = float(np.quantile(readings, self.q)) if len(readings) else 0.0
+            self._baselines[key] = baseline
+            for day, kwh, won in days:
+                self._rows.append((day, key[2], *_score(kwh, won, baseline), baseline))
+
+    def add_day(self, day, status: str, hour, kwh, won):
+        """
+        하루치 측정값(15분 단위 배열)을 그 달 스케치에 한 번에 반영 (평가는 daily() 에서).
+        비용은 그 날 측정값 수에 비례하고, 대상 측정값은 달이 끝날 때까지 보관한다.
+        """
+        day = pd.Timestamp(day)
+        hour = np.asarray(hour)
+        kwh = np.asarray(kwh, dtype=float)
+        won = np.asarray(won, dtype=float)
+
+        if status == '가동':
+            target = is_night(hour)
+        else:
+            target = np.ones(len(kwh), dtype=bool)
+        self._close_before(day.year, day.month)
+        key = (day.year, day.month, status)
+        if key not in self._open:
+            self._open[key] = _OpenMonth(self.q)
+        open_month = self._open[key]
+        open_month.sketch.update_many(kwh[target])
+        open_month.days.append((day, kwh[target], won[target]))
+        self._frame = None
+        if self.last_day is None or day > self.last_day:
+            self.last_day = day
+
+    def extend(self, cube: pd.DataFrame):
+        """슬롯 테이블(cube.build_slot_table, date 정렬)에서 last_day 이후 날짜만 순서대로 반영"""
+        if cube.empty:
+            return
+        if self.last_day is not None:
+            cube = cube[cube['date'] > self.last_day]
+        if cube.empty:
+            return
+        # 셀 평균을 측정 건수만큼 펼쳐 15분 측정값 단위로 반영
+        reps = cube['n'].to_numpy()
+        status = pd.Categorical(cube['작업휴무'])
+        dates = np.repeat(cube['date'].to_numpy(), reps)
+        codes = np.repeat(status.codes, reps)
+        kwh = np.repeat(cube['kwh'].to_numpy() / reps, reps)
+        won = np.repeat(cube['won'].to_numpy() / reps, reps)
+        hour = np.repeat(cube['hour'].to_numpy(), reps)
+
+        # (date, 작업휴무) 순으로 안정 정렬 후 경계마다 하루씩
+        order = np.lexsort((codes, dates))
+        dates, codes, kwh, won, hour = dates[order], codes[order], kwh[order], won[order], hour[order]
+        starts = np.flatnonzero(np.r_[True, (dates[1:] != dates[:-1]) | (codes[1:] != codes[:-1])])
+        ends = np.r_[starts[1:], len(dates)]
+        for lo, hi in zip(starts, ends):
+            self.add_day(dates[lo], str(status.categories[codes[lo]]), hour[lo:hi], kwh[lo:hi], won[lo:hi])
+
+    def daily(self) -> pd.DataFrame:
+        """
+        일별 손실표 (date, type, loss, cost, baseline) — 진행 중인 달은 현재 월 누계 베이스라인.
+        새 날이 들어온 뒤 첫 호출은 진행 중인 달의 모든 날을 다시 평가 (O(days-in-open-month)),
+        이후 호출은 만들어 둔 표를 그대로 돌려준다.
+        """
+        if self._frame is None:
+            rows = list(self._rows)
+            for (_, _, status), open_month in self._open.items():
+                baseline = open_month.sketch.value()
+                for day, kwh, won in open_month.days:
+                    rows.append((day, status, *_score(kwh, won, baseline), baseline))
+            frame = pd.DataFrame(rows, columns=self.COLUMNS)
+            self._frame = frame.sort_values(['date', 'type'], kind='stable').reset_index(drop=True)
+        return self._frame
+
+    def select(self, start=None, end=None, month: int | None = None,
+               work_status: str | None = None) -> pd.DataFrame:
+        """큐브 필터와 같은 조건으로 일별 손실표 부분 선택 (누적 손실 포함)"""
+        table = self.daily()
+        if table.empty:
+            return table
+        dates = table['date']
+        mask = np.ones(len(table), dtype=bool)
+        if start is not None:
+            mask &= (dates >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            mask &= (dates <= pd.Timestamp(end)).to_numpy()
+        if month is not None:
+            mask &= (dates.dt.month == month).to_numpy()
+        if work_status not in (None, '전체'):
+            mask &= (table['type'] == work_status).to_numpy()
+        out = table[mask].reset_index(drop=True)
+        out['cumulative_loss'] = out['loss'].cumsum().round(1)
+        return out
@@ -0,0 +1,56 @@
+import threading
+from collections import OrderedDict
+
+# ================================================================================
+# 필터 키 기반 LRU 캐시
+# ================================================================================
+# st.cache_data 는 인자로 받은 DataFrame 을 매 rerun 마다 전부 해싱해서 키를 만든다.
+# 필터 결과는 (분석 단위, 기간, 작업상태, 날짜 범위) 튜플로 이미 결정되므로
+# 그 튜플을 키로 쓰는 크기 제한 LRU 에 담고 히트/미스 수를 함께 센다.
+
+
+class BoundedLRU:
+    """크기 제한 LRU (스레드 안전, 히트/미스 통계 포함)"""
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = max(1, int(maxsize))
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get_or_compute(self, key, fn, *args, **kwargs):
+        """key 가 있으면 캐시된 값, 없으면 fn(*args, **kwargs) 결과를 저장 후 반환"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = fn(*args, **kwargs)
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """히트/미스/적중률/크기"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+        }
@@ -3,6 +3,8 @@ import google.generativeai as genai
 import pandas as pd
 import re
 import plotly.graph_objects as go
+from streaming import read_snapshot
+from summary import load_summary
 
 # 페이지 설정
 st.set_page_config(page_title="🤖 AI 챗봇", page_icon="🤖", layout="wide")
@@ -98,10 +100,19 @@ def load_data():
     return df
 
 
+@st.cache_data
+def load_monthly_summary():
+    """월별 요약 (summary.py 의 materialized 사이드카, 원본 재집계 없음)"""
+    monthly, _ = load_summary("대시보드/data_dash/train_dash_df.csv")
+    return monthly
+
+
 def load_december_data():
     """12월 실시간 스트리밍 데이터 로드"""
     try:
-        df_dec = pd.read_csv('대시보드/data_dash/december_streaming.csv')
+        df_dec = read_snapshot('대시보드/data_dash/december_streaming.csv')
+        if df_dec is None:
+            return None
         df_dec['측정일시'] = pd.to_datetime(df_dec['측정일시'])
         df_dec['month'] = 12
         df_dec['hour'] = df_dec['측정일시'].dt.hour
@@ -197,10 +208,7 @@ def generate_context(df):
 """
 
     # ========== 월별 분석 ==========
-    monthly = df.groupby('month').agg({
-        '전력사용량(kWh)': 'sum',
-        '전기요금(원)': 'sum'
-    }).reset_index()
+    monthly = load_monthly_summary()
     monthly = monthly[monthly['month'] <= 11]
     
     context += """
@@ -208,7 +216,7 @@ def generate_context(df):
 [월별 분석]
 """
     for _, row in monthly.iterrows():
-        context += f"\n  * {int(row['month'])}월: 사용량 {row['전력사용량(kWh)']:,.0f} kWh, 월 전기요금 {row['전기요금(원)']:,.0f} 원"
+        context += f"\n  * {int(row['month'])}월: 사용량 {row['kwh']:,.0f} kWh, 월 전기요금 {row['won']:,.0f} 원"
     
     # ========== 시간대별 분석 (1~11월 데이터만) ==========
     hourly = filtered_df.groupby('hour').agg({
@@ -1,66 +1,66 @@
 from docxtpl import DocxTemplate, InlineImage 
+from jinja2 import Environment
 from io import BytesIO
+from collections import deque
+import atexit
+import copy
+import hashlib
+import threading
+import time
 import pandas as pd
 import numpy as np
-import plotly.express as px
 from docx.shared import Inches
 from pathlib import Path
 import warnings
 import traceback
 import streamlit as st
-# report.py 최상단 어딘가 (streamlit import 아래 등)
-import matplotlib
-matplotlib.use("Agg")  # 헤드리스(배포) 환경용 백엔드
-import matplotlib.pyplot as plt
-from matplotlib import font_manager, rc # 👈 폰트 관리를 위한 라이브러리 추가
+from summary import load_summary, month_total, previous_month
+from lru_cache import BoundedLRU
 import os
-# report.py 상단 ---------------------------------------------------------------
-from pathlib import Path
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-from matplotlib import font_manager
-import plotly.express as px
 
 # === 1) 프로젝트 내 TTF 경로를 절대경로로 안전하게 잡기 ===
 # report.py 파일 기준으로 상대 경로를 계산
 _THIS = Path(__file__).resolve()
 FONT_PATH = (_THIS.parent / "data_dash" / "fonts" / "NanumGothic.ttf").resolve()
 
-# === 2) TTF를 Matplotlib에 등록 + 기본 폰트로 지정 ===
+# === 2) TTF를 Matplotlib에 등록 (지연 초기화) ===
+# 분석 페이지가 import 할 때 matplotlib 로드 / 폰트 등록 비용을 내지 않도록
+# 실제로 고지서 이미지를 만들 때 ensure_report_fonts() 가 한 번만 실행한다.
+# 전역 rcParams 는 건드리지 않고, 반환된 rc 설정을 차트마다 rc_context 로 적용한다.
 PLOT_FONT_FAMILY = "NanumGothic"  # Plotly에도 동일 이름을 넘길 예정
 
-def set_korean_font(ttf_path: Path):
+_font_rc = None
+_font_lock = threading.Lock()
+
+def set_korean_font(ttf_path: Path) -> dict:
+    """TTF 등록 → matplotlib rc 설정 dict (PLOT_FONT_FAMILY 갱신)"""
     global PLOT_FONT_FAMILY
     try:
         if ttf_path.exists():
-            # 폰트 등록
+            from matplotlib import font_manager
+
+            # 폰트 파일 하나만 등록 (전체 폰트 캐시 재구성 없음)
             font_manager.fontManager.addfont(str(ttf_path))
-            prop = font_manager.FontProperties(fname=str(ttf_path))
-            name = prop.get_name()          # 예: "NanumGothic"
+            name = font_manager.FontProperties(fname=str(ttf_path)).get_name()  # 예: "NanumGothic"
             PLOT_FONT_FAMILY = name         # Plotly에서 쓸 패밀리명
-            # Matplotlib 전역 설정
-            import matplotlib as mpl
-            mpl.rcParams["font.family"] = name
-            mpl.rcParams["axes.unicode_minus"] = False
-            # (선택) 캐시 리빌드
-            try:
-                font_manager._rebuild()
-            except Exception:
-                pass
             print(f"[report] ✅ 폰트 적용: {name} @ {ttf_path}")
-        else:
-            # 폰트 파일이 없을 때: 시스템에 설치된 나눔/맑은고딕을 시도
-            import matplotlib as mpl
-            # 우선순위: NanumGothic > Malgun Gothic > DejaVu Sans
-            mpl.rcParams["font.family"] = ["NanumGothic", "Malgun Gothic", "DejaVu Sans"]
-            mpl.rcParams["axes.unicode_minus"] = False
-            print(f"[report] ⚠️ 폰트 파일 없음: {ttf_path}. 시스템 폰트로 대체.")
+            return {"font.family": name, "axes.unicode_minus": False}
+        # 폰트 파일이 없을 때: 시스템에 설치된 나눔/맑은고딕을 시도
+        print(f"[report] ⚠️ 폰트 파일 없음: {ttf_path}. 시스템 폰트로 대체.")
     except Exception as e:
         print(f"[report] ❌ 폰트 설정 실패: {e}")
-
-set_korean_font(FONT_PATH)
-# ----------------------------------------------------------------------------- 
+    # 우선순위: NanumGothic > Malgun Gothic > DejaVu Sans
+    return {"font.family": ["NanumGothic", "Malgun Gothic", "DejaVu Sans"], "axes.unicode_minus": False}
+
+def ensure_report_fonts() -> dict:
+    """한글 폰트 1회 초기화 → 차트용 rc 설정 (이후 호출은 캐시된 값)"""
+    global _font_rc
+    if _font_rc is None:
+        with _font_lock:
+            if _font_rc is None:
+                _font_rc = set_korean_font(FONT_PATH)
+    return _font_rc
+# -----------------------------------------------------------------------------
 
 warnings.filterwarnings("ignore")
 
@@ -171,276 +171,511 @@ def calculate_monthly_power_factor(df):
     
     return pf_day, pf_night_lead
 
-def create_chart_image(df, chart_type):
-    """
-    그래프 이미지 생성 → PNG BytesIO 반환.
-    1) 먼저 Plotly+kaleido로 시도
-    2) 실패하면 matplotlib로 동일 차트를 생성
-    """
-    buf = BytesIO()
+def _monthly_comp_data(df, monthly=None):
+    """전월 비교 막대 (라벨, 값, 색) — 전월 값은 materialized 월별 요약(summary.py)의 실제 합계"""
+    current_month = int(df['month'].iloc[0])
+    current_year = int(df['측정일시'].iloc[0].year)
+    current_usage = float(df['전력사용량(kWh)'].sum())
+    if monthly is None:
+        try:
+            monthly, _ = load_summary()
+        except Exception as e:
+            print(f"[report.py] 월별 요약 로드 실패: {e}")
 
-    if df.empty:
-        # 빈 그래프라도 보여주자 (matplotlib 사용, 함수 내 import 금지!)
-        fig, ax = plt.subplots(figsize=(6, 3), dpi=150)
-        ax.text(0.5, 0.5, "데이터 없음", ha="center", va="center")
-        ax.axis("off")
-        fig.tight_layout()
-        fig.savefig(buf, format="png", bbox_inches="tight")
-        plt.close(fig)
-        buf.seek(0)
-        return buf
+    labels, values, colors = [f'{current_month}월'], [current_usage], ['#1f77b4']
+    prev_year, prev_month = previous_month(current_year, current_month)
+    prev_usage = month_total(monthly, prev_year, prev_month) if monthly is not None else None
+    if prev_usage is not None:  # 전월 데이터가 없으면 당월만 표시
+        labels.insert(0, f'{prev_month}월 (전월)')
+        values.insert(0, prev_usage)
+        colors.insert(0, '#ffb366')
+    return labels, values, colors
 
-    # ---------- 1) Plotly (+kaleido) 시도 ----------
+# =========================
+# 차트 래스터화 (백엔드 1회 선택 + PNG 캐시)
+# =========================
+# 예전에는 이미지마다 Plotly → kaleido 를 시도하고 예외가 나야 matplotlib 로 넘어가서
+# kaleido 가 없거나 브라우저 기동이 느린 환경에서 고지서 시간이 들쭉날쭉했다.
+# 백엔드는 프로세스에서 첫 이미지 때 한 번만 고른다.
+#   - kaleido   : 상주 브라우저(kaleido>=1.1 sync server / 0.2 scope)를 이미지 간 재사용
+#   - matplotlib: pyplot 전역 상태 없이 Figure + Agg 캔버스로 직접 그림
+# REPORT_CHART_BACKEND=auto|kaleido|matplotlib 로 지정 (auto: kaleido 가 되면 kaleido).
+# 같은 차트 데이터(chart_type, 데이터 digest)의 PNG 는 LRU 에서 재사용하고,
+# 이미지별 소요 시간은 CHART_TIMINGS 에 남겨 chart_timing_summary() 로 백엔드를 비교한다.
+
+CHART_BACKENDS = ('kaleido', 'matplotlib')
+CHART_WIDTH_PX, CHART_HEIGHT_PX = 600, 300
+
+CHART_PNG_CACHE = BoundedLRU(maxsize=64)
+CHART_TIMINGS = deque(maxlen=512)
+
+_chart_backend = None
+_chart_backend_lock = threading.Lock()
+
+
+def _start_kaleido() -> bool:
+    """kaleido 상주 프로세스 준비 + 작은 그림 1장으로 확인 (실패하면 False)"""
     try:
-        import plotly.express as px
+        import kaleido
+        import plotly.graph_objects as go
         import plotly.io as pio
 
-        if chart_type == 'daily_usage':
-            _df = df.copy()
-            _df['날짜'] = _df['측정일시'].dt.date.astype(str)
-            daily_usage = _df.groupby(['날짜', '작업유형'])['전력사용량(kWh)'].sum().reset_index()
-
-            fig = px.bar(
-                daily_usage, x='날짜', y='전력사용량(kWh)', color='작업유형',
-                title='일별 전력사용량 (부하 유형별)', color_discrete_map=LOAD_COLORS
-            )
-            fig.update_layout(
-                barmode='stack', height=300, margin=dict(t=50, b=50),
-                font=dict(size=10, color='black'),
-                legend=dict(orientation="h", yanchor="bottom", y=1.02)
-            )
-            fig.update_xaxes(tickangle=-45, showgrid=False)
-            fig.update_yaxes(showgrid=False)
-
-        elif chart_type == 'monthly_comp':
-            current_month = int(df['month'].iloc[0])
-            current_usage = float(df['전력사용량(kWh)'].sum())
-            prev_usage = current_usage * 0.9  # 임시
-            comp_data = pd.DataFrame({
-                '구분': [f'{current_month-1}월 (전월)', f'{current_month}월'],
-                '총 사용량': [prev_usage, current_usage]
-            })
-            fig = px.bar(
-                comp_data, x='구분', y='총 사용량', color='구분',
-                color_discrete_map={
-                    f'{current_month}월': '#1f77b4',
-                    f'{current_month-1}월 (전월)': '#ffb366'
-                },
-                text='총 사용량'
-            )
-            fig.update_traces(texttemplate='%{y:,.0f} kWh', textposition='outside', textfont_color='black')
-            fig.update_layout(
-                title='총 전력사용량 비교', height=300, showlegend=False,
-                margin=dict(t=50, b=50), font=dict(size=10, color='black')
-            )
-            fig.update_yaxes(title_text="총 전력사용량 (kWh)", showgrid=False)
-            fig.update_xaxes(title_text="", showgrid=False)
-        else:
-            fig = None
-
-        if fig is not None:
-            # kaleido 필요
-            png_bytes = pio.to_image(fig, format="png", width=600, height=300, scale=1)
-            buf.write(png_bytes)
-            buf.seek(0)
-            return buf
+        if hasattr(kaleido, 'start_sync_server'):  # kaleido >= 1.1: 이미지마다 브라우저를 띄우지 않음
+            kaleido.start_sync_server(silence_warnings=True)
+            atexit.register(kaleido.stop_sync_server, silence_warnings=True)
+        # kaleido 0.2 는 plotly.io.kaleido.scope 가 첫 호출 후 상주
+        pio.to_image(go.Figure(), format='png', width=16, height=16)
+        return True
     except Exception as e:
-        print(f"[report.py] Plotly->PNG 실패: {e}")
-
-    # ---------- 2) matplotlib 폴백 ----------
+        print(f"[report.py] kaleido 사용 불가 → matplotlib: {e}")
+        return False
+
+
+def set_chart_backend(name: str) -> str:
+    """차트 백엔드 지정 ('auto' 면 kaleido 가 되면 kaleido) → 실제 선택된 백엔드"""
+    global _chart_backend
+    name = (name or 'auto').lower()
+    if name not in ('auto', *CHART_BACKENDS):
+        raise ValueError(f"차트 백엔드는 auto / {' / '.join(CHART_BACKENDS)} 중 하나여야 합니다: {name!r}")
+    with _chart_backend_lock:
+        backend = 'kaleido' if name != 'matplotlib' and _start_kaleido() else 'matplotlib'
+        if name == 'kaleido' and backend != 'kaleido':
+            print("[report.py] kaleido 를 지정했지만 시작하지 못해 matplotlib 사용")
+        if backend != _chart_backend:
+            CHART_PNG_CACHE.clear()
+        _chart_backend = backend
+    print(f"[report] 차트 백엔드: {backend}")
+    return backend
+
+
+def chart_backend() -> str:
+    """현재 차트 백엔드 (처음 호출 때 REPORT_CHART_BACKEND 로 한 번 결정)"""
+    if _chart_backend is None:
+        set_chart_backend(os.environ.get('REPORT_CHART_BACKEND', 'auto'))
+    return _chart_backend
+
+
+def _chart_data(df, chart_type, monthly=None):
+    """차트에 그릴 값만 담은 작은 프레임 (PNG 캐시 digest 대상)"""
+    if df.empty:
+        return None
     if chart_type == 'daily_usage':
-        # 1) 날짜 정렬 + 날짜형으로 그룹핑
-        _df = df.copy().sort_values('측정일시')
-        _df['날짜'] = _df['측정일시'].dt.normalize()  # YYYY-MM-DD 00:00:00
-
-        daily_usage = (
-            _df.groupby(['날짜', '작업유형'])['전력사용량(kWh)']
-               .sum()
-               .unstack(fill_value=0)
+        daily = (
+            df.groupby([df['측정일시'].dt.normalize().rename('날짜'), '작업유형'], observed=True)
+              ['전력사용량(kWh)'].sum()
+              .unstack(fill_value=0)
+              .sort_index()
+        )
+        return daily.reindex(columns=list(LOAD_TYPES), fill_value=0)
+    if chart_type == 'monthly_comp':
+        labels, values, colors = _monthly_comp_data(df, monthly)
+        return pd.DataFrame({'구분': labels, '총 사용량': values, 'color': colors})
+    raise ValueError(f"알 수 없는 chart_type: {chart_type!r}")
+
+
+def _chart_digest(data) -> str:
+    """차트 데이터 digest (값 + 인덱스 + 컬럼명)"""
+    if data is None:
+        return 'empty'
+    h = hashlib.blake2b(digest_size=16)
+    h.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    h.update(repr(list(data.columns)).encode())
+    return h.hexdigest()
+
+
+def _png_kaleido(data, chart_type) -> bytes:
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    ensure_report_fonts()  # PLOT_FONT_FAMILY
+    if data is None:
+        fig = go.Figure()
+        fig.add_annotation(text="데이터 없음", showarrow=False, x=0.5, y=0.5, xref='paper', yref='paper')
+        fig.update_xaxes(visible=False)
+        fig.update_yaxes(visible=False)
+    elif chart_type == 'daily_usage':
+        x = data.index.strftime('%Y-%m-%d')
+        fig = go.Figure([
+            go.Bar(x=x, y=data[key], name=name, marker_color=LOAD_COLORS[key])
+            for key, name in LOAD_TYPES.items()
+        ])
+        fig.update_layout(
+            title='일별 전력사용량 (부하 유형별)', barmode='stack', margin=dict(t=50, b=50),
+            yaxis_title='전력사용량(kWh)', legend=dict(orientation="h", yanchor="bottom", y=1.02)
         )
+        fig.update_xaxes(tickangle=-45, showgrid=False)
+        fig.update_yaxes(showgrid=False)
+    else:
+        fig = go.Figure([
+            go.Bar(x=data['구분'], y=data['총 사용량'], marker_color=list(data['color']),
+                   texttemplate='%{y:,.0f} kWh', textposition='outside', textfont_color='black')
+        ])
+        fig.update_layout(title='총 전력사용량 비교', showlegend=False, margin=dict(t=50, b=50))
+        fig.update_yaxes(title_text="총 전력사용량 (kWh)", showgrid=False)
+        fig.update_xaxes(title_text="", showgrid=False)
+    fig.update_layout(height=CHART_HEIGHT_PX, font=dict(family=PLOT_FONT_FAMILY, size=10, color='black'))
+    return pio.to_image(fig, format="png", width=CHART_WIDTH_PX, height=CHART_HEIGHT_PX, scale=1)
+
+
+def _png_matplotlib(data, chart_type) -> bytes:
+    import matplotlib
+
+    with matplotlib.rc_context(ensure_report_fonts()):
+        return _draw_matplotlib(data, chart_type)
 
-        # 2) x축 라벨은 'MM-DD'만 표시
-        labels = pd.to_datetime(daily_usage.index).strftime('%m-%d')
-        n = len(daily_usage.index)
-
-        # 3) 시리즈 안전 추출
-        series = {
-            'Light_Load':  daily_usage.get('Light_Load',  pd.Series(0, index=daily_usage.index)),
-            'Medium_Load': daily_usage.get('Medium_Load', pd.Series(0, index=daily_usage.index)),
-            'Maximum_Load':daily_usage.get('Maximum_Load',pd.Series(0, index=daily_usage.index)),
-        }
-
-        fig, ax = plt.subplots(figsize=(6, 3), dpi=150)
-        bottom = np.zeros(n)
-
-        for key, label, color in [
-            ('Light_Load',  '경부하',   LOAD_COLORS['Light_Load']),
-            ('Medium_Load', '중간부하', LOAD_COLORS['Medium_Load']),
-            ('Maximum_Load','최대부하', LOAD_COLORS['Maximum_Load']),
-        ]:
-            vals = series[key].to_numpy() if hasattr(series[key], "to_numpy") else np.zeros(n)
-            ax.bar(labels, vals, bottom=bottom, label=label, color=color)
-            bottom += vals
 
+def _draw_matplotlib(data, chart_type) -> bytes:
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(6, 3), dpi=150)
+    ax = fig.subplots()
+    if data is None:
+        ax.text(0.5, 0.5, "데이터 없음", ha="center", va="center")
+        ax.axis("off")
+        fig.tight_layout()
+    elif chart_type == 'daily_usage':
+        # x축 라벨은 'MM-DD'만 표시
+        labels = data.index.strftime('%m-%d')
+        bottom = np.zeros(len(data))
+        for key, label in LOAD_TYPES.items():
+            vals = data[key].to_numpy(dtype=float)
+            ax.bar(labels, vals, bottom=bottom, label=label, color=LOAD_COLORS[key])
+            bottom += vals
         ax.set_title("일별 전력사용량 (부하 유형별)")
         ax.set_ylabel("kWh")
         ax.tick_params(axis='x', rotation=45)
         ax.grid(False)
-
-        # ✅ 범례는 하단 중앙으로 '한 번만' 표시
-        leg = ax.legend(
-            loc='center left',        # 축의 왼쪽 중앙을 기준으로
-            bbox_to_anchor=(1.02, 0.5),  # 축 바깥 오른쪽(1.02), 수직 중앙(0.5)
-            ncol=1,                   # 세로(1열)
-            frameon=False,
-            borderaxespad=0.0,        # 축과 범례 사이 여백 최소화
-            handlelength=1.5,         # 범례 마커 길이
-            labelspacing=0.6          # 라벨 간 여백
-        )
-
-        # ✅ 범례 공간 확보
-        plt.subplots_adjust(bottom=0.40)
-
-        # fig.tight_layout()
-        fig.savefig(buf, format="png", bbox_inches="tight")
-        plt.close(fig)
-        buf.seek(0)
-        return buf
-
-    elif chart_type == 'monthly_comp':
-        current_month = int(df['month'].iloc[0])
-        current_usage = float(df['전력사용량(kWh)'].sum())
-        prev_usage = current_usage * 0.9  # 임시
-        labels = [f'{current_month-1}월 (전월)', f'{current_month}월']
-        values = [prev_usage, current_usage]
-        colors = ['#ffb366', '#1f77b4']
-
-        fig, ax = plt.subplots(figsize=(6, 3), dpi=150)
-        ax.bar(labels, values, color=colors)
+        # 범례는 축 바깥 오른쪽에 세로 1열로 한 번만 표시
+        ax.legend(loc='center left', bbox_to_anchor=(1.02, 0.5), ncol=1, frameon=False,
+                  borderaxespad=0.0, handlelength=1.5, labelspacing=0.6)
+        fig.subplots_adjust(bottom=0.40)
+    else:
+        values = data['총 사용량'].tolist()
+        ax.bar(data['구분'], values, color=list(data['color']))
         for i, v in enumerate(values):
             ax.text(i, v, f"{v:,.0f} kWh", ha='center', va='bottom')
         ax.set_title("총 전력사용량 비교")
         ax.set_ylabel("kWh")
         ax.grid(False)
         fig.tight_layout()
-        fig.savefig(buf, format="png", bbox_inches="tight")
-        plt.close(fig)
-        buf.seek(0)
-        return buf
+    buf = BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight")  # Figure 는 기본 Agg 캔버스
+    return buf.getvalue()
+
+
+_CHART_RENDERERS = {'kaleido': _png_kaleido, 'matplotlib': _png_matplotlib}
+
+
+def create_chart_image(df, chart_type, monthly=None):
+    """
+    그래프 이미지 생성 → PNG BytesIO 반환 (호출마다 새 버퍼).
+    백엔드는 chart_backend() 로 한 번 정해지고, 같은 (chart_type, 데이터 digest) 는 캐시 재사용.
+    monthly: 전월 비교용 월별 요약 (없으면 summary.load_summary())
+    """
+    started = time.perf_counter()
+    backend = chart_backend()
+    data = _chart_data(df, chart_type, monthly)
+    key = (chart_type, _chart_digest(data))
+    misses = CHART_PNG_CACHE.misses
+    try:
+        png = CHART_PNG_CACHE.get_or_compute(key, _CHART_RENDERERS[backend], data, chart_type)
+    except Exception as e:
+        if backend == 'matplotlib':
+            raise
+        # 상주 kaleido 가 도중에 죽은 경우 이 이미지는 matplotlib 로
+        print(f"[report.py] kaleido PNG 실패 → matplotlib: {e}")
+        backend = 'matplotlib'
+        png = _png_matplotlib(data, chart_type)
+    CHART_TIMINGS.append({
+        'chart_type': chart_type,
+        'backend': backend,
+        'cached': CHART_PNG_CACHE.misses == misses,
+        'ms': (time.perf_counter() - started) * 1e3,
+        'bytes': len(png),
+    })
+    return BytesIO(png)
+
+
+def chart_timing_summary() -> pd.DataFrame:
+    """CHART_TIMINGS 집계 (백엔드 × 차트 × 캐시 여부별 건수 / 평균 / 중앙값 / 최대 ms)"""
+    timings = pd.DataFrame(list(CHART_TIMINGS),
+                           columns=['chart_type', 'backend', 'cached', 'ms', 'bytes'])
+    return (
+        timings.groupby(['backend', 'chart_type', 'cached'], sort=True)['ms']
+               .agg(count='count', mean='mean', median='median', max='max')
+               .reset_index()
+    )
+
+
+# =========================
+# 월별 요금 엔진 (벡터화)
+# =========================
+# 월(또는 고객 × 월) 단위 고지서 전체를 한 번의 groupby 로 계산한다.
+# 주간/야간 역률용 무효전력량, 부하 유형별 사용량을 마스크 곱으로 미리 펼쳐 두고
+# 그룹 합계 한 번으로 모두 얻으므로 12개월 고지서 비용이 1개월과 거의 같다.
 
+LOAD_TYPES = {'Light_Load': '경부하', 'Medium_Load': '중간부하', 'Maximum_Load': '최대부하'}
+BILL_LOAD_COLS = {'경부하': 'light', '중간부하': 'medium', '최대부하': 'max'}
+VAT_RATE = 0.1
 
+def season_of(month: int) -> str:
+    """월 → 요금 계절"""
+    return '겨울철' if month in [1, 2, 11, 12] else \
+           '여름철' if month in [6, 7, 8] else '봄·가을철'
 
+def compute_bills(df, by=None, month=None) -> pd.DataFrame:
+    """
+    월별 고지서 표 (한 번의 그룹 집계 + 벡터 연산).
+    - by: 고객 등 추가 그룹 컬럼 (없으면 단일 고객)
+    - month: 지정하면 월로 나누지 않고 (by 별) 전체를 해당 월 요금으로 1장 계산
+             (get_billing_data 의 선택 구간 고지서와 동일)
+    반환: by..., year, month, season, start, end, peak_kwh, won, kwh_<부하>, rate_<부하>,
+          fee_<부하>, energy_fee, basic_fee, pf_day, pf_night_lead, lag_penalty_pct,
+          lead_penalty_pct, lag_pf_fee, lead_pf_fee, subtotal, vat, total
+    """
+    by = [by] if isinstance(by, str) else list(by or [])
+    ts = df['측정일시']
+    if not pd.api.types.is_datetime64_any_dtype(ts):
+        ts = pd.to_datetime(ts)
+    hour = ts.dt.hour.to_numpy()
+    kwh = df['전력사용량(kWh)'].to_numpy(dtype=float)
+    lag = df['지상무효전력량(kVarh)'].to_numpy(dtype=float)
+    lead = df['진상무효전력량(kVarh)'].to_numpy(dtype=float)
+    day = ((hour >= 9) & (hour < 22)).astype(float)   # 주간 09:00~22:00
+    night = 1.0 - day
+
+    # 그룹 코드 (by..., year, month) 한 번 계산 후 정수 코드로 한 번에 집계
+    keys = {col: df[col].to_numpy() for col in by}
+    if month is None:
+        keys['year'] = ts.dt.year.to_numpy()
+        keys['month'] = ts.dt.month.to_numpy()
+    else:
+        keys['year'] = np.full(len(df), ts.dt.year.min() if len(df) else 0)
+        keys['month'] = np.full(len(df), int(month))
+    combined = np.zeros(len(df), dtype=np.int64)
+    for values in keys.values():
+        level_codes, uniques = pd.factorize(values, sort=True)
+        combined = combined * len(uniques) + level_codes
+    codes, _ = pd.factorize(combined, sort=True)
+    if len(codes) == 0:
+        return pd.DataFrame(columns=list(keys))
+    _, first = np.unique(codes, return_index=True)
+    keys = pd.DataFrame({name: values[first] for name, values in keys.items()})
+
+    load = df['작업유형'].to_numpy()
+    rows = {f'kwh_{BILL_LOAD_COLS[name]}': kwh * (load == load_type)
+            for load_type, name in LOAD_TYPES.items()}
+    rows.update(
+        kwh_day=kwh * day, lag_day=lag * day, lead_day=lead * day,
+        kwh_night=kwh * night, lag_night=lag * night, lead_night=lead * night,
+        won=df['전기요금(원)'].to_numpy(dtype=float),
+    )
+    sums = list(rows)
+    stamps = ts.to_numpy()
+    rows.update(peak_kwh=kwh, ts=stamps.view(np.int64))
+    grouped = pd.DataFrame(rows).groupby(codes, sort=True)
+    agg = grouped[sums].sum()
+    g = {c: agg[c].to_numpy() for c in sums}
+    n = len(agg)
+    peak_kwh = grouped['peak_kwh'].max().to_numpy()
+    start = grouped['ts'].min().to_numpy()
+    end = grouped['ts'].max().to_numpy()
+
+    # 역률 (calculate_monthly_power_factor 와 같은 식)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        net_lag = g['lag_day'] - g['lead_day']
+        pf_day = g['kwh_day'] / np.sqrt(g['kwh_day'] ** 2 + net_lag ** 2) * 100
+        pf_day = np.where((g['kwh_day'] > 0) & (net_lag >= 0), pf_day, 100.0)
+        net_night = np.abs(g['lead_night'] - g['lag_night'])
+        pf_night = g['kwh_night'] / np.sqrt(g['kwh_night'] ** 2 + net_night ** 2) * 100
+        pf_night = np.where(g['kwh_night'] > 0, pf_night, 100.0)
+    penalty = np.vectorize(calculate_power_factor_penalty, otypes=[float])
+    lag_pct = penalty(pf_day, 90.0)
+    lead_pct = penalty(pf_night, 95.0)
+
+    # 요금 (계절 단가를 월별 행에 매핑)
+    season = [season_of(int(m)) for m in keys['month']]
+    basic_fee = APPLIED_POWER * np.array([RATES_HIGH_B_II[s]['기본'] for s in season], dtype=float)
+    bills = {**{c: keys[c].to_numpy() for c in keys.columns}, 'season': season,
+             'start': start.view(stamps.dtype), 'end': end.view(stamps.dtype),
+             'peak_kwh': peak_kwh, 'won': g['won']}
+    energy_fee = np.zeros(n)
+    for name, col in BILL_LOAD_COLS.items():
+        rate = np.array([RATES_HIGH_B_II[s][name] for s in season], dtype=float)
+        fee = g[f'kwh_{col}'] * rate
+        bills.update({f'kwh_{col}': g[f'kwh_{col}'], f'rate_{col}': rate, f'fee_{col}': fee})
+        energy_fee += fee
+    lag_pf_fee = basic_fee * lag_pct / 100.0
+    lead_pf_fee = basic_fee * lead_pct / 100.0
+    subtotal = basic_fee + energy_fee + lag_pf_fee + lead_pf_fee
+    vat = subtotal * VAT_RATE
+    bills.update(
+        energy_fee=energy_fee, basic_fee=basic_fee, pf_day=pf_day, pf_night_lead=pf_night,
+        lag_penalty_pct=lag_pct, lead_penalty_pct=lead_pct, lag_pf_fee=lag_pf_fee,
+        lead_pf_fee=lead_pf_fee, subtotal=subtotal, vat=vat, total=subtotal + vat,
+    )
+    return pd.DataFrame(bills)
+
+def bill_context(bill) -> dict:
+    """고지서 표의 한 행 → 템플릿 Context"""
+    context = {
+        'month': int(bill['month']),
+        'start': pd.Timestamp(bill['start']).strftime('%Y-%m-%d'),
+        'end': pd.Timestamp(bill['end']).strftime('%Y-%m-%d'),
+        'peak': f"{bill['peak_kwh']:,.0f}",
+        '총_요금': f"{bill['won']:,.0f}",
+        'season': bill['season'],
+        '총_기본_요금': f"{bill['basic_fee']:,.0f}",
+    }
+    for name, col in BILL_LOAD_COLS.items():
+        context[f'{name}_단가'] = f"{bill[f'rate_{col}']:.1f}"
+        context[f'{name}총사용'] = f"{bill[f'kwh_{col}']:,.0f}"
+        context[f'총_{name}_요금'] = f"{bill[f'fee_{col}']:,.0f}"
+    context.update({
+        '평균지상역률': f"{bill['pf_day']:.2f}%",
+        '평균진상역률': f"{bill['pf_night_lead']:.2f}%",
+        '지상패널티율': f"{bill['lag_penalty_pct']:+.2f}%",
+        '진상패널티율': f"{bill['lead_penalty_pct']:+.2f}%",
+        '지상역률_요금': f"{bill['lag_pf_fee']:,.0f}",
+        '진상역률_요금': f"{bill['lead_pf_fee']:,.0f}",
+        '총_전력량_요금': f"{bill['energy_fee']:,.0f}",
+        '모든_요금_합': f"{bill['subtotal']:,.0f}",
+        '총_요금_세금_포함': f"{bill['total']:,.0f}",
+        '부가가치세': f"{bill['vat']:,.0f}",
+        # 그래프는 generate_report_from_template에서 주입
+    })
+    return context
 
 def get_billing_data(df):
-    """요금 데이터 계산 및 Context 생성"""
+    """요금 데이터 계산 및 Context 생성 (선택 구간 전체를 첫 달 요금으로 1장)"""
     if df.empty:
         return {}
+    bills = compute_bills(df, month=int(df['month'].iloc[0]))
+    return bill_context(bills.iloc[0])
 
-    # 기간 및 계절 결정
-    month = int(df['month'].iloc[0])
-    season_kor = '겨울철' if month in [1, 2, 11, 12] else \
-                 '여름철' if month in [6, 7, 8] else '봄·가을철'
-    rate_set = RATES_HIGH_B_II[season_kor]
-    
-    # 시간대별 사용량
-    usage_by_type = df.groupby('작업유형')['전력사용량(kWh)'].sum()
-    usage = {
-        '경부하': float(usage_by_type.get('Light_Load', 0.0)),
-        '중간부하': float(usage_by_type.get('Medium_Load', 0.0)),
-        '최대부하': float(usage_by_type.get('Maximum_Load', 0.0)),
-    }
-    
-    # 역률 계산
-    pf_day, pf_night_lead = calculate_monthly_power_factor(df)
-    
-    # 역률 패널티 계산
-    지상패널티율_pct = calculate_power_factor_penalty(pf_day, 90.0)
-    진상패널티율_pct = calculate_power_factor_penalty(pf_night_lead, 95.0)
-    
-    # 요금 계산
-    total_basic_fee = APPLIED_POWER * rate_set['기본']
-    fees = {
-        '경부하': usage['경부하'] * rate_set['경부하'],
-        '중간부하': usage['중간부하'] * rate_set['중간부하'],
-        '최대부하': usage['최대부하'] * rate_set['최대부하']
-    }
-    총_전력량_요금 = sum(fees.values())
-    지상역률_요금 = total_basic_fee * (지상패널티율_pct / 100.0)
-    진상역률_요금 = total_basic_fee * (진상패널티율_pct / 100.0)
-    모든_요금_합 = total_basic_fee + 총_전력량_요금 + 지상역률_요금 + 진상역률_요금
-    부가가치세 = 모든_요금_합 * 0.1
-    총_요금_세금_포함 = 모든_요금_합 + 부가가치세
-    
-    return {
-        'month': month,
-        'start': df['측정일시'].min().strftime('%Y-%m-%d'),
-        'end': df['측정일시'].max().strftime('%Y-%m-%d'),
-        'peak': f"{df['전력사용량(kWh)'].max():,.0f}",
-        '총_요금': f"{df['전기요금(원)'].sum():,.0f}",
-        'season': season_kor,
-        '총_기본_요금': f"{total_basic_fee:,.0f}",
-        '경부하_단가': f"{rate_set['경부하']:.1f}",
-        '경부하총사용': f"{usage['경부하']:,.0f}",
-        '총_경부하_요금': f"{fees['경부하']:,.0f}",
-        '중간부하_단가': f"{rate_set['중간부하']:.1f}",
-        '중간부하총사용': f"{usage['중간부하']:,.0f}",
-        '총_중간부하_요금': f"{fees['중간부하']:,.0f}",
-        '최대부하_단가': f"{rate_set['최대부하']:.1f}",
-        '최대부하총사용': f"{usage['최대부하']:,.0f}",
-        '총_최대부하_요금': f"{fees['최대부하']:,.0f}",
-        '평균지상역률': f"{pf_day:.2f}%",
-        '평균진상역률': f"{pf_night_lead:.2f}%",
-        '지상패널티율': f"{지상패널티율_pct:+.2f}%",
-        '진상패널티율': f"{진상패널티율_pct:+.2f}%",
-        '지상역률_요금': f"{지상역률_요금:,.0f}",
-        '진상역률_요금': f"{진상역률_요금:,.0f}",
-        '총_전력량_요금': f"{총_전력량_요금:,.0f}",
-        '모든_요금_합': f"{모든_요금_합:,.0f}",
-        '총_요금_세금_포함': f"{총_요금_세금_포함:,.0f}",
-        '부가가치세': f"{부가가치세:,.0f}",
-        # 그래프는 generate_report_from_template에서 주입
-    }
+class TemplateRenderError(RuntimeError):
+    """템플릿 렌더 실패 (Jinja 변수명 오류 등)"""
 
-def generate_report_from_template(filtered_df, template_path):
-    """최종 보고서 생성 (Bytes 반환). 이미지 안전 처리 포함."""
-    try:
-        tpl_path = Path(template_path).resolve()
-        if (not tpl_path.exists()) or tpl_path.is_dir():
-            st.error(f"템플릿 파일 누락 오류: 경로를 찾을 수 없습니다. 경로: {tpl_path}")
-            return None
+# =========================
+# 파싱된 템플릿 캐시
+# =========================
+# DocxTemplate 은 렌더마다 DOCX 압축 해제 + XML 파싱, 본문 XML 정리(patch_xml),
+# Jinja 컴파일을 처음부터 다시 한다. 셋 다 템플릿 파일에만 의존하므로
+# (경로, mtime) 별로 프로세스에 한 번만 만들어 두고, 렌더마다 파싱된 Document 의
+# 깊은 복사본에 렌더한다. (DocxTemplate 자체는 __getattr__ 위임 때문에 deepcopy 불가)
+# 배치 워커는 프로세스마다 첫 장에서 한 번만 파싱한다.
 
-        doc = DocxTemplate(str(tpl_path))
+class _ParsedTemplate:
+    """한 템플릿 파일의 파싱 결과 (Document + patch_xml / Jinja 컴파일 메모)"""
 
-        # 컨텍스트
-        context = get_billing_data(filtered_df)
-        if not context:
-            st.warning("선택 기간 데이터가 없어 고지서를 생성할 수 없습니다.")
-            return None
+    def __init__(self, path: str):
+        self.docx = DocxTemplate(path).get_docx()
+        self.patched = {}     # 원본 XML → patch_xml 결과
+        self.env = _CachedEnvironment()
 
-        # 그래프 이미지 생성 (한 번만 생성)
-        image_data1 = create_chart_image(filtered_df, 'daily_usage')
-        image_data2 = create_chart_image(filtered_df, 'monthly_comp')
 
-        # 안전 삽입
-        context['graph1'] = _safe_inline_image(doc, image_data1, width_in=3.0, use_placeholder=True)
-        context['graph2'] = _safe_inline_image(doc, image_data2, width_in=3.0, use_placeholder=True)
+class _CachedEnvironment(Environment):
+    """from_string 결과(컴파일된 Template)를 소스 문자열별로 재사용하는 Jinja 환경"""
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._compiled = {}
 
+    def from_string(self, source, globals=None, template_class=None):
+        if globals is not None or template_class is not None:
+            return super().from_string(source, globals, template_class)
+        template = self._compiled.get(source)
+        if template is None:
+            template = self._compiled[source] = super().from_string(source)
+        return template
 
-        # 템플릿 렌더
-        try:
-            doc.render(context)
-        except Exception as e:
-            # 템플릿 변수명(Jinja) 오류 등
-            st.error(f"고지서 렌더링 오류: {e}")
-            st.exception(e)
-            return None
 
-        file_stream = BytesIO()
-        doc.save(file_stream)
-        file_stream.seek(0)
-        return file_stream.read()
+class _CachedDocxTemplate(DocxTemplate):
+    """캐시된 _ParsedTemplate 의 복사본에 렌더하는 DocxTemplate"""
+
+    def __init__(self, path: str, parsed: _ParsedTemplate):
+        super().__init__(path)
+        self.docx = copy.deepcopy(parsed.docx)
+        self._parsed = parsed
+
+    def patch_xml(self, src_xml):
+        patched = self._parsed.patched.get(src_xml)
+        if patched is None:
+            patched = self._parsed.patched[src_xml] = super().patch_xml(src_xml)
+        return patched
+
+    def render(self, context, jinja_env=None, autoescape=False):
+        if jinja_env is None and not autoescape:
+            jinja_env = self._parsed.env
+        super().render(context, jinja_env, autoescape)
+
+
+_TEMPLATE_CACHE = {}
+
+
+def load_template(template_path) -> DocxTemplate:
+    """렌더용 DocxTemplate (같은 경로·mtime 이면 파싱 결과 재사용, 매번 새 복사본)"""
+    path = str(Path(template_path).resolve())
+    key = (path, os.stat(path).st_mtime_ns)
+    parsed = _TEMPLATE_CACHE.get(key)
+    if parsed is None:
+        # 파일이 바뀌면 같은 경로의 이전 버전은 버림
+        for old in [k for k in _TEMPLATE_CACHE if k[0] == path]:
+            del _TEMPLATE_CACHE[old]
+        parsed = _TEMPLATE_CACHE[key] = _ParsedTemplate(path)
+    return _CachedDocxTemplate(path, parsed)
+
+def render_report(filtered_df, template_path, monthly=None) -> bytes | None:
+    """
+    고지서 1장 렌더 → DOCX 바이트 (Streamlit 호출 없음, 배치 워커에서도 사용).
+    - 템플릿이 없으면 FileNotFoundError, 렌더 실패는 TemplateRenderError
+    - 선택 구간 데이터가 없으면 None
+    """
+    tpl_path = Path(template_path).resolve()
+    if (not tpl_path.exists()) or tpl_path.is_dir():
+        raise FileNotFoundError(f"템플릿 파일 누락 오류: 경로를 찾을 수 없습니다. 경로: {tpl_path}")
+
+    doc = load_template(tpl_path)
 
+    # 컨텍스트
+    context = get_billing_data(filtered_df)
+    if not context:
+        return None
+
+    # 그래프 이미지 생성 (한 번만 생성)
+    image_data1 = create_chart_image(filtered_df, 'daily_usage')
+    image_data2 = create_chart_image(filtered_df, 'monthly_comp', monthly)
+
+    # 안전 삽입
+    context['graph1'] = _safe_inline_image(doc, image_data1, width_in=3.0, use_placeholder=True)
+    context['graph2'] = _safe_inline_image(doc, image_data2, width_in=3.0, use_placeholder=True)
+
+    # 템플릿 렌더
+    try:
+        doc.render(context)
+    except Exception as e:
+        # 템플릿 변수명(Jinja) 오류 등
+        raise TemplateRenderError(f"고지서 렌더링 오류: {e}") from e
+
+    file_stream = BytesIO()
+    doc.save(file_stream)
+    return file_stream.getvalue()
+
+def generate_report_from_template(filtered_df, template_path, monthly=None):
+    """최종 보고서 생성 (Bytes 반환). 이미지 안전 처리 포함.
+    monthly: 전월 비교용 월별 요약 (페이지에서 로드한 summary.load_summary() 결과)"""
+    try:
+        data = render_report(filtered_df, template_path, monthly)
+        if data is None:
+            st.warning("선택 기간 데이터가 없어 고지서를 생성할 수 없습니다.")
+        return data
+    except FileNotFoundError as e:
+        st.error(str(e))
+        return None
+    except TemplateRenderError as e:
+        st.error(str(e))
+        st.exception(e.__cause__)
+        return None
     except Exception as e:
         st.error(f"고지서 생성 중 일반 오류 발생: {e}")
         st.exception(e)
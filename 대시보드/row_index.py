@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+# ================================================================================
+# 행 오프셋 인덱스
+# ================================================================================
+# 측정일시로 정렬된 프레임에서 월 / 일 / 작업휴무별 행 위치를 미리 계산해 두고,
+# 필터는 불리언 마스크 스캔 + .copy() 대신 iloc 슬라이스(연속 구간) 또는 take 로 푼다.
+
+
+class RowIndex:
+    """측정일시 정렬 프레임의 월/일/작업휴무 행 오프셋 테이블"""
+
+    def __init__(self, df: pd.DataFrame, time_col: str = '측정일시', status_col: str = '작업휴무'):
+        ts = df[time_col].to_numpy()
+        if len(ts) and not (ts[1:] >= ts[:-1]).all():
+            raise ValueError(f"'{time_col}' 기준으로 정렬된 프레임이 필요합니다.")
+        self.n_rows = len(df)
+
+        # 일: 고유 날짜와 시작 오프셋 (정렬되어 있으므로 [시작, 다음 날 시작) 이 하루)
+        days = ts.astype('datetime64[D]')
+        self.days, self.day_starts = np.unique(days, return_index=True)
+
+        # 월: 연도가 여러 개면 같은 월이 여러 구간으로 나뉘므로 (start, stop) 구간 목록
+        months = df[time_col].dt.month.to_numpy()
+        edges = np.flatnonzero(np.diff(months)) + 1
+        starts = np.r_[0, edges] if len(months) else np.array([], dtype=int)
+        stops = np.r_[edges, len(months)] if len(months) else np.array([], dtype=int)
+        self.month_runs = {}
+        for start, stop in zip(starts, stops):
+            self.month_runs.setdefault(int(months[start]), []).append((int(start), int(stop)))
+
+        # 작업휴무: 정렬된 행 위치 배열
+        status = df[status_col].to_numpy() if status_col in df.columns else np.array([])
+        self.status_rows = {
+            str(value): np.flatnonzero(status == value).astype(np.int32)
+            for value in pd.unique(status)
+        }
+
+    def day_range(self, start, end) -> slice:
+        """[start, end] 날짜 구간의 행 슬라이스"""
+        lo = np.searchsorted(self.days, np.datetime64(str(start), 'D'), 'left')
+        hi = np.searchsorted(self.days, np.datetime64(str(end), 'D'), 'right')
+        row_lo = int(self.day_starts[lo]) if lo < len(self.days) else self.n_rows
+        row_hi = int(self.day_starts[hi]) if hi < len(self.days) else self.n_rows
+        return slice(row_lo, max(row_lo, row_hi))
+
+    def month_rows(self, month: int):
+        """해당 월의 행 (구간이 하나면 슬라이스, 여러 개면 위치 배열)"""
+        runs = self.month_runs.get(int(month), [])
+        if not runs:
+            return slice(0, 0)
+        if len(runs) == 1:
+            return slice(*runs[0])
+        return np.concatenate([np.arange(a, b, dtype=np.int32) for a, b in runs])
+
+    def with_status(self, rows, status: str):
+        """행 선택(슬라이스/위치 배열)을 작업휴무 값으로 좁힌 위치 배열"""
+        pos = self.status_rows.get(status, np.array([], dtype=np.int32))
+        if isinstance(rows, slice):
+            lo, hi = np.searchsorted(pos, [rows.start, rows.stop])
+            return pos[lo:hi]
+        return np.intersect1d(rows, pos, assume_unique=True)
+
+    def select(self, df: pd.DataFrame, rows) -> pd.DataFrame:
+        """슬라이스면 iloc 뷰, 위치 배열이면 take"""
+        if isinstance(rows, slice):
+            return df.iloc[rows]
+        return df.take(rows)
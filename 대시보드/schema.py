@@ -0,0 +1,135 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ================================================================================
+# 대시보드 공용 dtype 정책
+# ================================================================================
+# st.cache_data 는 인자/반환 프레임을 호출마다 pickle·복사하므로 프레임이 작을수록
+# 캐시 히트 비용도 줄어든다. 페이지마다 따로 int64 / 문자열 컬럼을 만들지 않도록
+# 모든 로더가 이 정책을 거친다.
+#   - 측정일시      : datetime64
+#   - 범주형        : 작업유형 / 작업휴무 / 시간대 → category
+#   - 실수 측정값   : float32 (역률 / 무효전력량 등 비율·계측값)
+#   - 합산 컬럼     : 전력사용량 / 전기요금 / 탄소배출량 / 단가는 float64 유지
+#                     (원 단위 월 합계가 float32 반올림으로 어긋나지 않도록)
+#   - 정수 컬럼     : 값 범위에 맞춰 int8 / int16 / int32 로 축소
+#   - date          : 자정으로 내린 datetime64 (pandas 최소 단위가 초라서 [D] 대신 사용,
+#                     문자열 비교 / nunique / groupby 는 기존과 동일하게 동작)
+
+SCHEMA_VERSION = '3'
+
+DATETIME_COLS = ('측정일시',)
+CATEGORY_COLS = ('작업유형', '작업휴무', '시간대')
+FLOAT64_COLS = (
+    '전력사용량(kWh)', '전기요금(원)', '탄소배출량(tCO2)', '단가',
+    '전력사용량_예측', '전기요금_예측', '탄소배출량_예측',
+)
+
+# 야간(22:00~08:00)을 22..31 로 이어 붙인 야간 기준 시각
+NIGHT_START, NIGHT_END = 22, 8
+NIGHT_HOURS = np.arange(NIGHT_START, NIGHT_END + 24)
+
+CALENDAR_DTYPES = {
+    'year': 'int16',
+    'month': 'int8',
+    'day': 'int8',
+    'hour': 'int8',
+    'minute': 'int8',
+}
+
+
+def compact_frame(df: pd.DataFrame, datetime_cols=DATETIME_COLS,
+                  category_cols=CATEGORY_COLS, float64_cols=FLOAT64_COLS) -> pd.DataFrame:
+    """dtype 정책 적용 (제자리 변환 후 같은 프레임 반환)"""
+    for col in datetime_cols:
+        if col in df.columns:
+            parsed = pd.to_datetime(df[col], errors='coerce')
+            bad = int((parsed.isna() & df[col].notna()).sum())
+            if bad:
+                # 형식이 깨진 값은 NaT 로 남기되 조용히 넘기지 않고 건수를 알린다
+                print(f"[schema] {col}: 날짜로 읽을 수 없는 값 {bad:,}건 → NaT", file=sys.stderr)
+            df[col] = parsed
+    for col in category_cols:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    for col in df.select_dtypes(include='float64').columns.difference(float64_cols, sort=False):
+        df[col] = df[col].astype('float32')
+    for col in df.select_dtypes(include='int64').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+
+def is_night(hour) -> np.ndarray:
+    """야간(22:00~08:00) 여부"""
+    hour = np.asarray(hour)
+    return (hour >= NIGHT_START) | (hour < NIGHT_END)
+
+
+def add_calendar_columns(df: pd.DataFrame, time_col: str = '측정일시') -> pd.DataFrame:
+    """year / month / day / hour / minute / date 파생 컬럼 추가 (축소 dtype)"""
+    dt = df[time_col].dt
+    parts = {
+        'year': dt.year, 'month': dt.month, 'day': dt.day,
+        'hour': dt.hour, 'minute': dt.minute,
+    }
+    return df.assign(
+        **{name: values.astype(CALENDAR_DTYPES[name]) for name, values in parts.items()},
+        date=dt.normalize(),
+    )
+
+
+# ================================================================================
+# 메모리 리포트
+# ================================================================================
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """컬럼별 dtype / 메모리(바이트) 전후 비교표 (마지막 행은 합계)"""
+    mem_before = before.memory_usage(deep=True, index=False)
+    mem_after = after.memory_usage(deep=True, index=False)
+    cols = list(dict.fromkeys([*before.columns, *after.columns]))
+    report = pd.DataFrame({
+        'dtype_before': [str(before[c].dtype) if c in before else '-' for c in cols],
+        'dtype_after': [str(after[c].dtype) if c in after else '-' for c in cols],
+        'bytes_before': [int(mem_before.get(c, 0)) for c in cols],
+        'bytes_after': [int(mem_after.get(c, 0)) for c in cols],
+    }, index=cols)
+    report.loc['합계'] = ['', '', report['bytes_before'].sum(), report['bytes_after'].sum()]
+    report['ratio'] = (report['bytes_after'] / report['bytes_before'].where(report['bytes_before'] > 0)).round(3)
+    return report
+
+
+def _legacy_frame(csv_path) -> pd.DataFrame:
+    """정책 적용 전 로드 방식 (int64 파생 컬럼 + 문자열 date)"""
+    df = pd.read_csv(csv_path)
+    df['측정일시'] = pd.to_datetime(df['측정일시'], errors='coerce')
+    dt = df['측정일시']
+    return df.assign(
+        year=dt.dt.year.astype('int64'), month=dt.dt.month.astype('int64'),
+        day=dt.dt.day.astype('int64'), hour=dt.dt.hour.astype('int64'),
+        minute=dt.dt.minute.astype('int64'), date=dt.dt.date.astype(str).astype(object),
+    )
+
+
+def main(paths) -> None:
+    """python schema.py [CSV ...] → 대시보드 CSV 전후 메모리 리포트 출력"""
+    if not paths:
+        paths = sorted((Path(__file__).parent / 'data_dash').glob('*.csv'))
+    for path in map(Path, paths):
+        try:
+            before = _legacy_frame(path)
+        except (KeyError, ValueError):
+            continue  # 측정일시가 없는 요약 테이블은 대상 아님
+        after = add_calendar_columns(compact_frame(pd.read_csv(path)))
+        report = memory_report(before, after)
+        total = report.loc['합계']
+        print(f"\n=== {path.name} ({len(after):,} rows) ===")
+        print(report.to_string())
+        print(f"→ {total['bytes_before'] / 1024:,.0f} KiB → {total['bytes_after'] / 1024:,.0f} KiB "
+              f"({total['ratio']:.1%})")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,318 @@
+import os
+import threading
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ================================================================================
+# 실시간 모니터 누적 버퍼
+# ================================================================================
+# 매 틱마다 pd.concat 으로 누적 프레임을 다시 만들면 n번째 스텝 비용이 O(n)이 되므로,
+# 전체 재생 길이만큼 컬럼별 NumPy 배열을 미리 잡아두고 커서만 전진시킨다.
+
+TIME_COL = '측정일시'
+KPI_COLS = ['전력사용량_예측', '전기요금_예측', '탄소배출량_예측']
+
+
+def day_key(ts) -> np.ndarray:
+    """일자 키 (측정일시는 15분 구간의 종료 시각이므로 00:00 행은 전날로 묶음)"""
+    ts = np.asarray(ts, dtype='datetime64[ns]')
+    return (ts - np.timedelta64(1, 's')).astype('datetime64[D]')
+
+
+class StreamAggregator:
+    """누적 KPI 증분 집계기 (새로 들어온 행만 더함)"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.kwh = 0.0
+        self.won = 0.0
+        self.tco2 = 0.0
+        self.peak_kwh = 0.0
+        self.last_day = None
+        self.daily = {}     # 날짜 -> [kWh, 원, tCO2]
+        self.by_load = {}   # 작업유형 -> [kWh, 원, tCO2]
+
+    def update(self, rows: pd.DataFrame):
+        """새 행(들)의 합계를 누적 / 일별 / 부하유형별 합계에 반영"""
+        if rows.empty:
+            return
+        vals = rows[KPI_COLS].to_numpy(dtype=float)
+        kwh, won, tco2 = vals.sum(axis=0)
+        self.kwh += kwh
+        self.won += won
+        self.tco2 += tco2
+        self.peak_kwh = max(self.peak_kwh, float(vals[:, 0].max()))
+        days = day_key(rows[TIME_COL])
+        self.last_day = days[-1]
+        self._accumulate(self.daily, days, vals)
+        self._accumulate(self.by_load, rows['작업유형'].to_numpy(), vals)
+
+    @staticmethod
+    def _accumulate(table, keys, vals):
+        uniq, inv = np.unique(keys, return_inverse=True)
+        sums = np.zeros((len(uniq), vals.shape[1]))
+        np.add.at(sums, inv, vals)
+        for key, row in zip(uniq, sums):
+            table[key] = table.get(key, 0.0) + row
+
+    def day_total(self, day, idx: int = 0) -> float:
+        """해당 날짜 합계 (idx: 0=kWh, 1=원, 2=tCO2)"""
+        row = self.daily.get(day)
+        return float(row[idx]) if row is not None else 0.0
+
+
+class StreamBuffer:
+    """사전 할당된 컬럼 지향 누적 버퍼 (쓰기 커서 방식)"""
+
+    def __init__(self, template: pd.DataFrame, capacity: int | None = None):
+        self.columns = list(template.columns)
+        self.capacity = len(template) if capacity is None else int(capacity)
+        self._arrays = {
+            col: np.empty(self.capacity, dtype=template[col].to_numpy().dtype)
+            for col in self.columns
+        }
+        # 당일 조회용 일자 키
+        self._day = np.empty(self.capacity, dtype='datetime64[D]')
+        self.stats = StreamAggregator()
+        self.reset()
+
+    def __len__(self):
+        return self._cursor
+
+    def reset(self):
+        """커서와 누적 집계 초기화 (배열은 재사용)"""
+        self._cursor = 0
+        self.stats.reset()
+
+    # ---- 쓰기 ----
+    def append(self, rows: pd.DataFrame) -> int:
+        """새로 스트리밍된 행(들)을 커서 위치에 기록하고 기록한 행 수 반환"""
+        k = min(len(rows), self.capacity - self._cursor)
+        if k <= 0:
+            return 0
+        start, stop = self._cursor, self._cursor + k
+        for col in self.columns:
+            self._arrays[col][start:stop] = rows[col].to_numpy()[:k]
+        self._day[start:stop] = day_key(self._arrays[TIME_COL][start:stop])
+        self.stats.update(rows.iloc[:k])
+        self._cursor = stop
+        return k
+
+    # ---- 조회 ----
+    def frame(self, start: int = 0, stop: int | None = None) -> pd.DataFrame:
+        """[start, stop) 구간을 DataFrame으로 반환"""
+        stop = self._cursor if stop is None else min(stop, self._cursor)
+        start = max(0, start)
+        return pd.DataFrame(
+            {col: self._arrays[col][start:stop] for col in self.columns},
+            index=pd.RangeIndex(start, stop)
+        )
+
+    def tail(self, n: int) -> pd.DataFrame:
+        """최근 n개 포인트"""
+        return self.frame(self._cursor - n, self._cursor)
+
+    def today_start(self) -> int:
+        """마지막 행과 같은 날짜가 시작되는 위치 (날짜 키는 정렬되어 있음)"""
+        if self._cursor == 0:
+            return 0
+        days = self._day[:self._cursor]
+        return int(np.searchsorted(days, days[-1], side='left'))
+
+    def today(self) -> pd.DataFrame:
+        """당일 누적분"""
+        return self.frame(self.today_start(), self._cursor)
+
+    def latest(self) -> pd.Series | None:
+        """가장 최근 행 (비어 있으면 None)"""
+        if self._cursor == 0:
+            return None
+        return self.frame(self._cursor - 1, self._cursor).iloc[0]
+
+
+# ================================================================================
+# 스트리밍 로그 싱크 (append-only)
+# ================================================================================
+# 매 틱 전체 이력을 to_csv 로 다시 쓰지 않고 새 행만 이어 쓴다.
+# 읽는 쪽(CHAPBOT 등)은 커밋 파일에 기록된 바이트 길이까지만 읽으므로
+# 쓰는 도중의 반쪽짜리 행을 보지 않는다. 커밋 파일은 임시 파일 + os.replace 로 원자적 교체.
+
+COMMIT_SUFFIX = '.commit'
+
+
+class StreamingSink:
+    """append-only CSV 로그 + 원자적 커밋 길이 공개"""
+
+    def __init__(self, path, columns, sync_every: int = 1, encoding: str = 'utf-8-sig'):
+        self.path = Path(path)
+        self.commit_path = self.path.with_name(self.path.name + COMMIT_SUFFIX)
+        self.columns = list(columns)
+        self.sync_every = max(1, int(sync_every))
+        self.encoding = encoding
+        self._fh = None
+        self._pending = 0
+
+    def _open(self):
+        if self._fh is None:
+            self._fh = open(self.path, 'ab')
+        return self._fh
+
+    def _header(self) -> bytes:
+        return pd.DataFrame(columns=self.columns).to_csv(index=False).encode(self.encoding)
+
+    def truncate(self):
+        """로그를 헤더만 남기고 비움 (리셋)"""
+        self.close()
+        self._fh = open(self.path, 'wb')
+        self._fh.write(self._header())
+        self._pending = 0
+        self.sync()
+
+    def append(self, rows: pd.DataFrame):
+        """새 행(들)만 로그 끝에 기록, sync_every 회마다 fsync + 커밋"""
+        if rows.empty:
+            return
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            self.truncate()
+        fh = self._open()
+        fh.write(rows[self.columns].to_csv(index=False, header=False).encode('utf-8'))
+        self._pending += 1
+        if self._pending >= self.sync_every:
+            self.sync()
+
+    def sync(self):
+        """버퍼 flush + fsync 후 커밋된 길이를 원자적으로 공개"""
+        fh = self._open()
+        fh.flush()
+        os.fsync(fh.fileno())
+        tmp = self.commit_path.with_name(self.commit_path.name + '.tmp')
+        tmp.write_text(str(fh.tell()), encoding='ascii')
+        os.replace(tmp, self.commit_path)
+        self._pending = 0
+
+    def close(self):
+        if self._fh is not None:
+            try:
+                if self._pending:
+                    self.sync()
+            finally:
+                self._fh.close()
+                self._fh = None
+
+
+def read_snapshot(path, **read_kwargs) -> pd.DataFrame | None:
+    """커밋된 길이까지만 읽어 일관된 스냅샷 반환 (커밋 파일이 없으면 전체)"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    commit_path = path.with_name(path.name + COMMIT_SUFFIX)
+    with open(path, 'rb') as fh:
+        try:
+            length = int(commit_path.read_text(encoding='ascii'))
+            data = fh.read(length)
+        except (FileNotFoundError, ValueError):
+            data = fh.read()
+    if not data:
+        return None
+    return pd.read_csv(BytesIO(data), **read_kwargs)
+
+
+# ================================================================================
+# 공용 재생 엔진
+# ================================================================================
+# 세션마다 full_data / 커서 / 버퍼를 따로 들고 시뮬레이션을 돌리지 않도록
+# 프로세스당 하나의 백그라운드 스레드가 커서와 버퍼를 소유한다.
+# 세션은 lock 을 잡고 읽기만 하므로 시청자 수와 무관하게 메모리/CPU가 일정하다.
+
+class ReplayEngine:
+    """프로세스 공용 재생 엔진 (백그라운드 스레드)"""
+
+    def __init__(self, data: pd.DataFrame, sink: StreamingSink | None = None,
+                 interval: float = 2.0, rows_per_tick: int = 1):
+        self.data = data
+        self.buffer = StreamBuffer(data)
+        self.sink = sink
+        self.interval = float(interval)
+        self.rows_per_tick = int(rows_per_tick)
+        self.step = 0
+        self.running = False
+        self.completed_runs = 0   # 끝까지 재생된 횟수 (세션별 완료 알림용)
+        self.lock = threading.RLock()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='replay-engine', daemon=True)
+        self._thread.start()
+
+    def __len__(self):
+        return len(self.data)
+
+    # ---- 제어 ----
+    def start(self):
+        with self.lock:
+            self.running = True
+        self._wake.set()
+
+    def stop(self):
+        with self.lock:
+            self.running = False
+
+    def reset(self):
+        with self.lock:
+            self.running = False
+            self._reset_buffer()
+
+    def configure(self, interval: float | None = None, rows_per_tick: int | None = None):
+        with self.lock:
+            if interval is not None:
+                self.interval = float(interval)
+            if rows_per_tick is not None:
+                self.rows_per_tick = int(rows_per_tick)
+
+    def seek(self, stop: int):
+        """stop 위치까지 한 번의 슬라이스로 누적 (뒤로 이동 시 처음부터 재구성)"""
+        with self.lock:
+            self._advance(stop)
+
+    # ---- 내부 ----
+    def _sink_call(self, name, *args):
+        if self.sink is None:
+            return
+        try:
+            getattr(self.sink, name)(*args)
+        except OSError:
+            pass
+
+    def _reset_buffer(self):
+        """버퍼 / 커서를 처음으로 — 스트리밍 로그도 항상 함께 비움 (읽는 쪽과 일치)"""
+        self.step = 0
+        self.buffer.reset()
+        self._sink_call('truncate')
+
+    def _advance(self, stop):
+        stop = max(0, min(int(stop), len(self.data)))
+        if stop < self.step:
+            self._reset_buffer()
+        rows = self.data.iloc[self.step:stop]
+        if rows.empty:
+            return
+        self.buffer.append(rows)
+        if self.step == 0:
+            self._sink_call('truncate')
+        self._sink_call('append', rows)
+        self.step = stop
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            with self.lock:
+                if not self.running:
+                    continue
+                self._advance(self.step + self.rows_per_tick)
+                if self.step >= len(self.data):
+                    self.running = False
+                    self.completed_runs += 1
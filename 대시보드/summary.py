@@ -0,0 +1,93 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cube import MEASURES
+from data_cache import derived_path, read_derived, read_typed_csv
+
+# ================================================================================
+# 월별 / 일별 요약 테이블 (materialized)
+# ================================================================================
+# 분석 페이지(월별 추이 / 전월 비교 / 다운로드), CHAPBOT 컨텍스트의 월별 블록,
+# report.py 의 전월 비교 차트가 같은 월별 kWh / 요금 합계를 각자 원본에서 다시
+# 집계하지 않도록, train_dash_df.csv 에서 한 번 만든 요약을 CSV 옆
+# <이름>.daily.parquet / <이름>.monthly.parquet 로 저장해 두고 원본이 바뀔 때만 다시 만든다.
+
+SOURCE_CSV = Path(__file__).resolve().parent / 'data_dash' / 'train_dash_df.csv'
+SUMMARY_VERSION = '1'
+
+# 합계로 요약하는 측정값 (이름은 cube.MEASURES 와 동일)
+SUM_MEASURES = ('kwh', 'won', 'lag_kvarh', 'lead_kvarh', 'tco2')
+
+
+def build_daily(df: pd.DataFrame) -> pd.DataFrame:
+    """원본 15분 데이터 → 일별 요약 (date, year, month, 합계, peak_kwh, n, 작업휴무)"""
+    if '단가' in df.columns:
+        df = df.dropna(subset=['단가'])  # 분석 페이지 로더와 같은 행만 사용
+    dt = pd.to_datetime(df['측정일시'])
+    frame = pd.DataFrame({'date': dt.dt.normalize().to_numpy()})
+    for name in SUM_MEASURES:
+        col = MEASURES[name]
+        frame[name] = (pd.to_numeric(df[col], errors='coerce').fillna(0).to_numpy(dtype='float64')
+                       if col in df.columns else 0.0)
+    frame['working'] = (df['작업휴무'] == '가동').to_numpy() if '작업휴무' in df.columns else True
+
+    grouped = frame.groupby('date', sort=True)
+    daily = grouped[list(SUM_MEASURES)].sum()
+    daily['peak_kwh'] = grouped['kwh'].max()
+    daily['n'] = grouped.size().astype('int32')
+    # 하루는 가동/휴무 중 하나 (가동 측정이 하나라도 있으면 가동일)
+    daily['작업휴무'] = pd.Categorical(np.where(grouped['working'].any(), '가동', '휴무'),
+                                    categories=['가동', '휴무'])
+    daily = daily.reset_index()
+    daily.insert(1, 'year', daily['date'].dt.year.astype('int16'))
+    daily.insert(2, 'month', daily['date'].dt.month.astype('int8'))
+    return daily
+
+
+def build_monthly(daily: pd.DataFrame) -> pd.DataFrame:
+    """일별 요약 → 월별 요약 (year, month, 합계, won_mean, peak_kwh, n, days, 가동일/휴무일)"""
+    grouped = daily.groupby(['year', 'month'], sort=True)
+    monthly = grouped[[*SUM_MEASURES, 'n']].sum()
+    monthly['peak_kwh'] = grouped['peak_kwh'].max()
+    monthly['days'] = grouped.size().astype('int16')
+    working = (daily['작업휴무'] == '가동').groupby([daily['year'], daily['month']]).sum()
+    monthly['working_days'] = working.astype('int16')
+    monthly['holiday_days'] = (monthly['days'] - monthly['working_days']).astype('int16')
+    # 15분 측정 1건당 평균 요금 (분석 페이지 월별 추이의 '평균 전기요금')
+    monthly['won_mean'] = monthly['won'] / monthly['n'].where(monthly['n'] > 0)
+    return monthly.reset_index()
+
+
+def load_summary(csv_path=SOURCE_CSV) -> tuple:
+    """(월별 요약, 일별 요약) — 유효한 사이드카가 있으면 원본을 다시 읽지 않음"""
+    daily = read_derived(csv_path, 'daily', lambda: build_daily(read_typed_csv(csv_path)),
+                         SUMMARY_VERSION)
+    monthly = read_derived(csv_path, 'monthly', lambda: build_monthly(daily), SUMMARY_VERSION)
+    return monthly, daily
+
+
+def month_total(monthly: pd.DataFrame, year: int, month: int, col: str = 'kwh') -> float | None:
+    """해당 연·월 합계 (요약에 없으면 None)"""
+    row = monthly[(monthly['year'] == year) & (monthly['month'] == month)]
+    return float(row[col].iloc[0]) if len(row) else None
+
+
+def previous_month(year: int, month: int) -> tuple:
+    """전월 (연, 월) — 1월이면 전년 12월"""
+    return (year - 1, 12) if month == 1 else (year, month - 1)
+
+
+def main(paths) -> None:
+    """python summary.py [CSV ...] → 요약 사이드카 생성 후 월별 요약 출력"""
+    for path in map(Path, paths or [SOURCE_CSV]):
+        monthly, daily = load_summary(path)
+        print(f"\n=== {path.name}: {len(daily):,} days / {len(monthly):,} months ===")
+        print(f"→ {derived_path(path, 'daily').name}, {derived_path(path, 'monthly').name}")
+        print(monthly[['year', 'month', 'kwh', 'won', 'days', 'working_days']].to_string(index=False))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])